@@ -0,0 +1,70 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Rendering a page of widgets which each wait on I/O.
+
+``prefetch`` fetches every widget's data in turn before building the page,
+as was needed before Components could be async.
+"""
+
+import asyncio
+import time
+from typing import Any, List
+
+from benchmarks.common import print_table
+from bmx.aio import render_async
+from bmx.core import Component
+from bmx.htmltags import div, p
+
+LATENCY = 0.01
+WIDGETS = (1, 10, 50)
+
+
+async def fetch(idx: int) -> str:
+    await asyncio.sleep(LATENCY)
+    return f"Widget {idx}"
+
+
+@Component
+async def widget(*contents: Any, idx: int = 0, **attributes: Any) -> Any:
+    return +div(class_="widget") + p + await fetch(idx) - p - div
+
+
+async def prefetch(count: int) -> str:
+    data = [await fetch(idx) for idx in range(count)]
+    page = +div + [+div(class_="widget") + p + text - p - div for text in data] - div
+    return str(page)
+
+
+async def concurrent(count: int) -> str:
+    page = +div + [+widget(idx=idx) - widget for idx in range(count)] - div
+    return "".join([chunk async for chunk in render_async(page)])
+
+
+def timed(coroutine: Any) -> List[Any]:
+    loop = asyncio.new_event_loop()
+    try:
+        start = time.perf_counter()
+        result = loop.run_until_complete(coroutine)
+        return [time.perf_counter() - start, result]
+    finally:
+        loop.close()
+
+
+def main() -> None:
+    rows = []
+    for count in WIDGETS:
+        before, expected = timed(prefetch(count))
+        after, result = timed(concurrent(count))
+        assert result == expected  # noqa: S101
+        rows.append((count, f"{before * 1e3:.1f}", f"{after * 1e3:.1f}"))
+    print_table(
+        f"widgets with {LATENCY * 1e3:.0f}ms latency",
+        ("widgets", "prefetch in turn ms", "render_async ms"),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
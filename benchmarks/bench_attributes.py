@@ -0,0 +1,118 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Serialization of attribute-heavy markup: forms and tables with data-* attributes.
+
+``per_character_attributes`` reproduces the previous attribute loop, which
+extended a list one character at a time.
+"""
+
+from typing import Any, Dict, List
+
+from benchmarks.common import best_of, print_table
+from bmx.core import _render_attributes, Element, Fragment, SelfClosingTag
+from bmx.htmltags import form, input_, label, table, tbody, td, tr
+
+
+def per_character_attributes(attributes: Dict[str, Any]) -> str:
+    rendered: List[str] = []
+    for key, value in attributes.items():
+        if str(key).endswith("_"):
+            key = key[:-1]
+        if value is True:
+            rendered.extend(" " + key)
+            continue
+        elif value is False:
+            continue
+        elif isinstance(value, list):
+            value = " ".join(value)
+        rendered.extend(" " + str(key) + '="' + str(value) + '"')
+    return "".join(rendered)
+
+
+def build_form(fields: int) -> Fragment:
+    return (
+        +form(action="/submit", method="post", class_="form-horizontal")
+        + (
+            +label(for_=f"field-{idx}", class_="control-label")
+            + f"Field {idx}"
+            - label
+            + input_(
+                type_="text",
+                id_=f"field-{idx}",
+                name=f"field_{idx}",
+                class_="form-control input-sm",
+                placeholder=f"Enter field {idx}",
+                required=True,
+                disabled=False,
+            )
+            for idx in range(fields)
+        )
+        - form
+    )
+
+
+def build_table(rows: int) -> Fragment:
+    return (
+        +table(class_="table table-striped")
+        + tbody
+        + (
+            +tr(data_row_id=str(row), data_state="active", class_="row")
+            + (
+                +td(data_column=str(col), data_sort_value=str(row * col), title="cell")
+                + str(col)
+                - td
+                for col in range(5)
+            )
+            - tr
+            for row in range(rows)
+        )
+        - tbody
+        - table
+    )
+
+
+def attribute_nodes(node: Any) -> List[Any]:
+    found = []
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, (Element, SelfClosingTag)):
+            found.append(item)
+        if isinstance(item, Element):
+            stack.extend(item.contents)
+        elif isinstance(item, Fragment):
+            stack.extend(item)
+    return found
+
+
+def main() -> None:
+    rows = []
+    for name, page in (("form", build_form(2_000)), ("table", build_table(2_000))):
+        nodes = attribute_nodes(page)
+        legacy = best_of(
+            lambda: [per_character_attributes(node.attributes) for node in nodes]
+        )
+        current = best_of(
+            lambda: [_render_attributes(node.attributes) for node in nodes]
+        )
+        page_str = best_of(lambda: str(page))
+        rows.append(
+            (
+                name,
+                len(nodes),
+                f"{legacy * 1e3:.2f}",
+                f"{current * 1e3:.2f}",
+                f"{page_str * 1e3:.2f}",
+            )
+        )
+    print_table(
+        "attribute rendering",
+        ("page", "nodes", "per-char ms", "_render_attributes ms", "cached str() ms"),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
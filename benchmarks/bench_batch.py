@@ -0,0 +1,97 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Pages per second rendering one layout for many records.
+
+The navigation shared by every page is static, and ``compiled_layout`` is the
+same layout decorated with ``bmx.compile``.
+"""
+
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict
+
+from benchmarks.common import print_table
+from bmx import compile, static
+from bmx.batch import render_many, write_many
+from bmx.core import DOCTYPE
+from bmx.htmltags import a, body, div, footer, h1, head, html, li, nav, p, title, ul
+
+RECORDS = 20_000
+LINKS = [(f"/section/{idx}", f"Section {idx}") for idx in range(10)]
+NAVIGATION = static(
+    +nav
+    + ul
+    + (+li + a(href=href) + caption - a - li for href, caption in LINKS)
+    - ul
+    - nav
+)
+
+
+def layout(record: Dict[str, Any]) -> Any:
+    page = DOCTYPE.html + html + head + title + record["title"] - title - head
+    page += +body + NAVIGATION
+    page += +div(class_="content") + h1 + record["title"] - h1
+    page += +p + record["text"] - p - div
+    return page + footer + "Generated with BMX" - footer - body - html
+
+
+compiled_layout = compile(layout)
+
+
+def records() -> Any:
+    return (
+        {"id": idx, "title": f"Page {idx}", "text": f"Text of page {idx} " * 5}
+        for idx in range(RECORDS)
+    )
+
+
+def pages_per_second(func: Callable[[], Any]) -> str:
+    start = time.perf_counter()
+    func()
+    return f"{RECORDS / (time.perf_counter() - start):,.0f}"
+
+
+def main() -> None:
+    processes = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as directory:
+
+        def path(record: Dict[str, Any]) -> str:
+            return os.path.join(directory, f"{record['id']}.html")
+
+        rows = [
+            (
+                "str() each",
+                "",
+                pages_per_second(lambda: [str(layout(r)) for r in records()]),
+            ),
+            (
+                "render_many",
+                "",
+                pages_per_second(lambda: list(render_many(layout, records()))),
+            ),
+            (
+                "render_many, compiled",
+                "",
+                pages_per_second(lambda: list(render_many(compiled_layout, records()))),
+            ),
+            (
+                "render_many",
+                processes,
+                pages_per_second(
+                    lambda: list(render_many(layout, records(), processes=processes))
+                ),
+            ),
+            (
+                "write_many",
+                "",
+                pages_per_second(lambda: write_many(layout, records(), path)),
+            ),
+        ]
+    print_table(f"{RECORDS} pages", ("render", "processes", "pages/s"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Rendering the README's Flask greeter and a navigation list compiled and not."""
+
+from typing import Any, List
+
+from benchmarks.common import best_of, print_table
+from bmx import compile
+from bmx.core import DOCTYPE, Fragment
+from bmx.htmltags import a, body, head, html, li, p, title, ul
+
+CALLS = 10_000
+
+
+class NavigationItem:
+    def __init__(self: "NavigationItem", href: str, caption: str) -> None:
+        self.href = href
+        self.caption = caption
+
+
+def greeter(name: str) -> Fragment:
+    page = DOCTYPE.html + html + head + title + "Flask Greeter" - title - head
+    return page + body + p + f"Hello {name}" - p - body - html
+
+
+def navigation(items: List[NavigationItem]) -> Fragment:
+    links = (+li + a(href=item.href) + item.caption - a - li for item in items)
+    return +ul("#navigation") + links - ul
+
+
+def main() -> None:
+    items = [NavigationItem(f"/{idx}", f"Page {idx}") for idx in range(20)]
+    cases: Any = (("greeter", greeter, "Stuart"), ("navigation x20", navigation, items))
+    rows = []
+    for label, func, argument in cases:
+        compiled = compile(func)
+        assert compiled(argument) == str(func(argument))  # noqa: S101
+        interpreted = best_of(lambda: [str(func(argument)) for _ in range(CALLS)])
+        fast = best_of(lambda: [compiled(argument) for _ in range(CALLS)])
+        rows.append(
+            (
+                label,
+                f"{interpreted / CALLS * 1e6:.2f}",
+                f"{fast / CALLS * 1e6:.2f}",
+                f"{interpreted / fast:.1f}x",
+            )
+        )
+    print_table(
+        "compile",
+        ("template", "interpreted us/call", "compiled us/call", "speedup"),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
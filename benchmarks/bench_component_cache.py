@@ -0,0 +1,64 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Rendering a grid of product cards with and without a component cache."""
+
+from typing import Any
+
+from benchmarks.common import best_of, print_table
+from bmx import LRU
+from bmx.core import Component
+from bmx.htmltags import a, div, h2, img, p
+
+CARDS = 100
+PRODUCTS = 20
+
+
+def card(*contents: Any, product: int = 0, **attributes: Any) -> Any:
+    return (
+        +div(class_="card")
+        + img(src=f"/img/{product}.png", alt=f"Product {product}")
+        + h2
+        + f"Product {product}"
+        - h2
+        + p
+        + contents
+        - p
+        + a(href=f"/product/{product}")
+        + "Buy"
+        - a
+        - div
+    )
+
+
+def grid(component: Any) -> str:
+    cards = (
+        +component(product=idx % PRODUCTS) + "Description" - component
+        for idx in range(CARDS)
+    )
+    return str(+div(class_="grid") + cards - div)
+
+
+def main() -> None:
+    plain = Component(card)
+    cache = LRU(maxsize=PRODUCTS)
+    cached = Component(cache=cache)(card)
+    assert grid(plain) == grid(cached)  # noqa: S101
+    rows = [
+        ("uncached", f"{best_of(lambda: grid(plain)) * 1e3:.2f}", ""),
+        (
+            "LRU",
+            f"{best_of(lambda: grid(cached)) * 1e3:.2f}",
+            f"{cache.hit_ratio:.1%}",
+        ),
+    ]
+    print_table(
+        f"{CARDS} cards of {PRODUCTS} products",
+        ("component", "ms/page", "hit ratio"),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
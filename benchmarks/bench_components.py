@@ -0,0 +1,103 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Time and memory to define 500 components, and to render them all once.
+
+``class_per_component`` reproduces the previous ``Component``, which created
+new tag classes for every component it was applied to.
+"""
+
+import gc
+import time
+import tracemalloc
+from abc import ABC
+from typing import Any, Callable, List, Tuple
+
+from benchmarks.common import print_table
+from bmx.core import Component, Fragment, StartTag, Tag
+from bmx.htmltags import div
+
+COMPONENTS = 500
+
+
+def class_per_component(func: Callable) -> Tag:
+    class RenderMixin(ABC):
+        __slots__ = ()
+
+        def render(self: "RenderMixin", *args: Any, **kwargs: Any) -> Any:
+            return func(*args, **kwargs)
+
+    class StartComponentTag(RenderMixin, StartTag):
+        __slots__ = ()
+
+    class ComponentTag(Tag):
+        __slots__ = ()
+
+        def create_start_tag(self: "ComponentTag") -> StartTag:
+            return StartComponentTag(self.name, **self.attributes)
+
+    return ComponentTag(func.__name__.replace("_", "-"))
+
+
+def make_function(idx: int) -> Callable:
+    def component(*contents: Any, **attributes: Any) -> Any:
+        return +div(class_=f"component-{idx}") + contents - div
+
+    component.__name__ = f"component_{idx}"
+    return component
+
+
+def define(decorator: Callable) -> Tuple[List[Tag], float, int]:
+    functions = [make_function(idx) for idx in range(COMPONENTS)]
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        components = [decorator(func) for func in functions]
+        elapsed = time.perf_counter() - start
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return components, elapsed, size
+
+
+def render(components: List[Tag]) -> Tuple[float, int]:
+    # Each component goes through Fragment.__add__, whose dispatch cache holds
+    # an entry per type it has seen
+    dispatch_cache = Fragment.__add__.register.__self__.cache  # type: ignore
+    entries = len(dispatch_cache)
+    start = time.perf_counter()
+    fragment = Fragment()
+    for component in components:
+        fragment = fragment + component + "x" - component
+    str(fragment)
+    return time.perf_counter() - start, len(dispatch_cache) - entries
+
+
+def main() -> None:
+    rows = []
+    for label, decorator in (
+        ("class per component", class_per_component),
+        ("shared classes", Component),
+    ):
+        components, elapsed, size = define(decorator)
+        render_time, new_entries = render(components)
+        rows.append(
+            (
+                label,
+                f"{elapsed * 1e3:.2f}",
+                f"{size / 1024:.0f}",
+                f"{render_time * 1e3:.2f}",
+                new_entries,
+            )
+        )
+    print_table(
+        f"{COMPONENTS} components",
+        ("components", "define ms", "KiB", "first render ms", "new dispatch entries"),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
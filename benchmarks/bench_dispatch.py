@@ -0,0 +1,101 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Per-operator dispatch overhead: typedispatchmethod vs singledispatchmethod."""
+
+from collections.abc import Iterable
+from typing import Any
+
+from benchmarks.common import best_of, print_table
+from bmx.core import EndTag, Fragment, StartTag, Tag, typedispatchmethod
+
+try:
+    # >=3.8
+    from functools import singledispatchmethod  # type: ignore
+except ImportError:
+    # <=3.7
+    from singledispatchmethod import singledispatchmethod  # type: ignore
+
+CALLS = 100_000
+
+
+class SingleDispatch:
+    @singledispatchmethod
+    def __add__(self: "SingleDispatch", other: Any) -> Any:
+        return self
+
+    @__add__.register(Tag)
+    def _add_Tag(self: "SingleDispatch", other: Tag) -> Any:
+        return self
+
+    @__add__.register(str)
+    def _add_str(self: "SingleDispatch", other: str) -> Any:
+        return self
+
+    @__add__.register(Iterable)
+    def _add_Iterable(self: "SingleDispatch", other: Iterable) -> Any:
+        return self
+
+
+class TypeDispatch:
+    @typedispatchmethod
+    def __add__(self: "TypeDispatch", other: Any) -> Any:
+        return self
+
+    @__add__.register(Tag)
+    def _add_Tag(self: "TypeDispatch", other: Tag) -> Any:
+        return self
+
+    @__add__.register(str)
+    def _add_str(self: "TypeDispatch", other: str) -> Any:
+        return self
+
+    @__add__.register(Iterable)
+    def _add_Iterable(self: "TypeDispatch", other: Iterable) -> Any:
+        return self
+
+
+def run(obj: Any, operands: Any) -> None:
+    for operand in operands:
+        obj + operand
+
+
+def main() -> None:
+    samples = {
+        "str": "text",
+        "StartTag": StartTag("td"),
+        "EndTag": EndTag("td"),
+        "tuple (ABC)": (),
+        "float (default)": 1.5,
+    }
+    rows = []
+    for label, sample in samples.items():
+        operands = [sample] * CALLS
+        single = best_of(lambda: run(SingleDispatch(), operands)) / CALLS
+        typed = best_of(lambda: run(TypeDispatch(), operands)) / CALLS
+        rows.append(
+            (
+                label,
+                f"{single * 1e9:.0f}",
+                f"{typed * 1e9:.0f}",
+                f"{single / typed:.1f}x",
+            )
+        )
+    print_table(
+        "dispatch only",
+        ("operand", "singledispatch ns", "typedispatch ns", "speedup"),
+        rows,
+    )
+
+    operands = ["text"] * CALLS
+    seconds = best_of(lambda: run(Fragment(), operands))
+    print_table(
+        "Fragment + str",
+        ("calls", "ns/operator"),
+        [(CALLS, f"{seconds / CALLS * 1e9:.0f}")],
+    )
+
+
+if __name__ == "__main__":
+    main()
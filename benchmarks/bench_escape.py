@@ -0,0 +1,65 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Escaping the cells of a table, with markupsafe.escape and with BMX's layer.
+
+The cells are ids, names and descriptions that are mostly unique, and
+repeated statuses, categories and prices.
+"""
+
+import random
+from typing import List
+
+from markupsafe import escape
+
+from benchmarks.common import best_of, print_table
+from bmx.core import _escape, _escape_all
+
+ROWS = 10_000
+
+STATUSES = ["Active", "Pending", "Closed", "On hold"]
+CATEGORIES = ["Fruit & veg", "Bakery", "Dairy", "Drinks", "Frozen <new>"]
+
+
+def table_cells() -> List[str]:
+    rng = random.Random(0)
+    cells: List[str] = []
+    for idx in range(ROWS):
+        cells.extend(
+            (
+                str(idx),
+                f"Customer {rng.randrange(2000)}",
+                f'Order notes for {idx}: "{rng.choice(STATUSES)}"',
+                rng.choice(STATUSES),
+                rng.choice(CATEGORIES),
+                f"{rng.randrange(100)}.{rng.randrange(100):02}",
+            )
+        )
+    return cells
+
+
+def main() -> None:
+    cells = table_cells()
+    count = len(cells)
+    plain = best_of(lambda: [escape(cell) for cell in cells])
+    layer = best_of(lambda: [_escape(cell) for cell in cells])
+    batch = best_of(lambda: _escape_all(cells))
+    rows = [
+        ("markupsafe.escape", f"{plain / count * 1e9:.0f}", "1.0x"),
+        (
+            "_escape, one at a time",
+            f"{layer / count * 1e9:.0f}",
+            f"{plain / layer:.1f}x",
+        ),
+        (
+            "_escape_all, whole list",
+            f"{batch / count * 1e9:.0f}",
+            f"{plain / batch:.1f}x",
+        ),
+    ]
+    print_table(f"escaping {count} table cells", ("escape", "ns/cell", "speedup"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Fragment building: time per operator should stay flat as pages grow."""
+
+from benchmarks.common import best_of, print_table
+from bmx.core import Fragment
+from bmx.htmltags import a, div, li, ul
+
+SIZES = (100, 1_000, 10_000, 50_000)
+
+
+def build_chain(rows: int) -> Fragment:
+    result = +ul
+    for idx in range(rows):
+        result = result + li + a(href=f"/item/{idx}") + f"Item {idx}" - a - li
+    return result - ul
+
+
+def build_generator(rows: int) -> Fragment:
+    return (
+        +ul
+        + (+li + a(href=f"/item/{idx}") + f"Item {idx}" - a - li for idx in range(rows))
+        - ul
+    )
+
+
+def build_nested(depth: int) -> Fragment:
+    result = Fragment()
+    for _ in range(depth):
+        result = result + div + "x"
+    for _ in range(depth):
+        result = result - div
+    return result
+
+
+def main() -> None:
+    for builder in (build_chain, build_generator, build_nested):
+        rows = []
+        for size in SIZES:
+            seconds = best_of(lambda: builder(size), repeat=3)
+            rows.append((size, f"{seconds * 1e3:.2f}", f"{seconds / size * 1e6:.3f}"))
+        print_table(builder.__name__, ("rows", "total ms", "us/row"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Rendering a page whose sidebar and product grid are cached regions."""
+
+from typing import Any
+
+from benchmarks.common import best_of, print_table
+from bmx import cached, FragmentCache
+from bmx.htmltags import a, aside, body, div, h2, html, li, main as main_, p, ul
+
+LINKS = 200
+PRODUCTS = 100
+
+
+def sidebar() -> Any:
+    return (
+        +ul
+        + (
+            +li + a(href=f"/category/{idx}") + f"Category {idx}" - a - li
+            for idx in range(LINKS)
+        )
+        - ul
+    )
+
+
+def grid() -> Any:
+    return (
+        +div(class_="grid")
+        + (
+            +div(class_="card") + h2 + f"Product {idx}" - h2 + p + "In stock" - p - div
+            for idx in range(PRODUCTS)
+        )
+        - div
+    )
+
+
+def page(nav: Any, products: Any) -> str:
+    return str(
+        +html + body + aside + nav - aside + main_ + products - main_ - body - html
+    )
+
+
+def main() -> None:
+    cache = FragmentCache()
+
+    def cached_page() -> str:
+        return page(
+            cached("sidebar", sidebar, tags=["categories"], cache=cache),
+            cached("grid", grid, ttl=60, tags=["products"], cache=cache),
+        )
+
+    def invalidated_page() -> str:
+        cache.invalidate("products")
+        return cached_page()
+
+    assert page(sidebar(), grid()) == cached_page()  # noqa: S101
+    rows = [
+        ("rebuilt", best_of(lambda: page(sidebar(), grid()))),
+        ("cached", best_of(cached_page)),
+        ("grid invalidated", best_of(invalidated_page)),
+    ]
+    print_table(
+        f"page with {LINKS} links and {PRODUCTS} products",
+        ("regions", "ms/page"),
+        [(name, f"{seconds * 1e3:.3f}") for name, seconds in rows],
+    )
+    print(f"hit ratio: {cache.hit_ratio:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Time taken to import bmx.
+
+Each import is timed in a new interpreter, with bytecode cached in a temporary
+directory as it would be in an installed package. The previous, eager imports
+are reproduced by using every export of ``bmx`` and every tag of
+``bmx.htmltags`` as soon as they are imported.
+"""
+
+import os
+import subprocess  # noqa: S404
+import sys
+import tempfile
+from typing import Dict
+
+from benchmarks.common import best_of, print_table
+from bmx import htmltags
+from bmx.htmltags import _SELF_CLOSING
+
+REPEAT = 10
+
+# What importing bmx and its tags used to create
+EAGER = "from bmx import *; import bmx.htmltags; "
+EAGER += "[getattr(bmx.htmltags, name) for name in bmx.htmltags._SELF_CLOSING]"
+
+# Times the statement, as -X importtime does not include creating the tags
+TIMER = (
+    "import time\nstart = time.perf_counter()\n{}\nprint(time.perf_counter() - start)"
+)
+
+STATEMENTS = {
+    "bmx": ("from bmx import *", "import bmx"),
+    "bmx.core": (f"{EAGER}; import bmx.core", "import bmx.core"),
+    "bmx.htmltags": (EAGER, "import bmx.htmltags"),
+}
+
+
+def import_time(statement: str, env: Dict[str, str]) -> float:
+    """Return the time taken by statement in a new interpreter, in milliseconds."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", TIMER.format(statement)],
+        env=env,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    return float(result.stdout) * 1e3
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as cache:
+        env = dict(os.environ, PYTHONPYCACHEPREFIX=cache, PYTHONDONTWRITEBYTECODE="")
+        rows = []
+        for label, statements in STATEMENTS.items():
+            row = [label]
+            for statement in statements:
+                import_time(statement, env)
+                best = min(import_time(statement, env) for _ in range(REPEAT))
+                row.append(f"{best:.2f}")
+            rows.append(row)
+    print_table(
+        f"import time in ms, with dependencies, best of {REPEAT}",
+        ("import", "eager", "lazy"),
+        rows,
+    )
+    # What importing bmx.htmltags used to cost on top of bmx.core
+    seconds = best_of(lambda: [getattr(htmltags, name) for name in _SELF_CLOSING])
+    created = best_of(lambda: [htmltags.__getattr__(name) for name in _SELF_CLOSING])
+    print(f"creating all {len(_SELF_CLOSING)} tags: {created * 1e3:.2f} ms")
+    print(
+        f"looking up all {len(_SELF_CLOSING)} tags once created: {seconds * 1e3:.3f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
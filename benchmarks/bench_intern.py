@@ -0,0 +1,73 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""EndTag allocations while building a 10k-row table.
+
+The "per close" column restores the previous Tag.__neg__, which created a new
+EndTag every time.
+"""
+
+from typing import Any, Callable
+
+from benchmarks.common import best_of, print_table
+from bmx.core import EndTag, Fragment, Tag
+from bmx.htmltags import table, td, tr
+
+ROWS = 10_000
+
+
+def build_table() -> Fragment:
+    # Built statement by statement, so every closing tag is a unary -tag
+    result = Fragment(+table)
+    for _ in range(ROWS):
+        result += +tr
+        for col in range(5):
+            result += +td
+            result += str(col)
+            result += -td
+        result += -tr
+    result += -table
+    return result
+
+
+def count_end_tags(build: Callable[[], Any]) -> int:
+    created = 0
+    original_init = EndTag.__init__
+
+    def counting_init(self: EndTag, _name: str) -> None:
+        nonlocal created
+        created += 1
+        original_init(self, _name)
+
+    EndTag.__init__ = counting_init  # type: ignore
+    try:
+        build()
+    finally:
+        EndTag.__init__ = original_init  # type: ignore
+    return created
+
+
+def main() -> None:
+    interned_neg = Tag.__neg__
+    rows = []
+    for label, neg in (
+        ("per close", lambda self: EndTag(self.name)),
+        ("interned", interned_neg),
+    ):
+        Tag.__neg__ = neg  # type: ignore
+        try:
+            rows.append(
+                (
+                    label,
+                    count_end_tags(build_table),
+                    f"{best_of(build_table, repeat=3) * 1e3:.1f}",
+                )
+            )
+        finally:
+            Tag.__neg__ = interned_neg  # type: ignore
+    print_table(f"{ROWS} row table", ("EndTag", "EndTags allocated", "build ms"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Adding generators and lists to a Fragment.
+
+``item_by_item`` reproduces the previous ``Fragment._add_Iterable``, which
+added and dispatched each item separately.
+"""
+
+from typing import Any, Iterable
+
+from benchmarks.common import best_of, print_table
+from bmx.core import Fragment
+from bmx.htmltags import a, li, ul
+
+SIZES = (1_000, 10_000, 100_000)
+
+
+def item_by_item(fragment: Fragment, items: Iterable) -> Fragment:
+    for item in items:
+        fragment = fragment + item
+    return fragment
+
+
+def navigation(size: int) -> Any:
+    return (+li + a(href=f"/{idx}") + f"Page {idx}" - a - li for idx in range(size))
+
+
+def main() -> None:
+    rows = []
+    for size in SIZES:
+        rows_of_fragments = list(navigation(size))
+        strings = [f"Item {idx}" for idx in range(size)]
+        for label, items in (("row Fragments", rows_of_fragments), ("strs", strings)):
+            before = best_of(lambda: item_by_item(Fragment(+ul), items), repeat=3)
+            after = best_of(lambda: +ul + items, repeat=3)
+            rows.append(
+                (
+                    label,
+                    size,
+                    f"{before * 1e3:.2f}",
+                    f"{after * 1e3:.2f}",
+                    f"{after / size * 1e6:.3f}",
+                )
+            )
+        generator = best_of(lambda: +ul + navigation(size) - ul, repeat=3)
+        rows.append(("README generator", size, "", f"{generator * 1e3:.2f}", ""))
+    print_table(
+        "Fragment + iterable",
+        ("items", "count", "item by item ms", "single pass ms", "us/item"),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Peak memory exporting a table from a row generator, eagerly and lazily."""
+
+import os
+import time
+import tracemalloc
+from typing import Any, Callable, Iterator, Tuple
+
+from benchmarks.common import print_table
+from bmx import Lazy
+from bmx.htmltags import table, td, tr
+
+SIZES = (10_000, 50_000)
+
+
+def cursor(size: int) -> Iterator[Tuple[int, str, float]]:
+    return ((idx, f"name {idx}", idx * 1.5) for idx in range(size))
+
+
+def rows(size: int) -> Iterator[Any]:
+    return (+tr + [+td + str(col) - td for col in row] - tr for row in cursor(size))
+
+
+def measure(build: Callable[[], Any]) -> Tuple[str, str]:
+    with open(os.devnull, "w") as fp:
+        tracemalloc.start()
+        try:
+            start = time.perf_counter()
+            build().write_to(fp)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return f"{peak / 1024:,.0f}", f"{elapsed * 1e3:,.0f}"
+
+
+def main() -> None:
+    results = []
+    for size in SIZES:
+        eager = measure(lambda: +table + rows(size) - table)
+        lazy = measure(lambda: +table + Lazy(rows(size)) - table)
+        results.append((size, *eager, *lazy))
+    print_table(
+        "table export with write_to",
+        ("rows", "eager peak KiB", "eager ms", "Lazy peak KiB", "Lazy ms"),
+        results,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Memory held per node, measured with tracemalloc.
+
+``DictElement``, ``DictStartTag`` and ``DictEndTag`` reproduce the previous
+nodes, which stored their attributes in a per-instance ``__dict__``, gave
+every node without attributes its own empty dict and kept contents in a list.
+"""
+
+import gc
+import tracemalloc
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Type
+
+from benchmarks.common import print_table
+from bmx.core import Element, EndTag, StartTag
+
+NODES = 50_000
+
+
+class DictElement:
+    def __init__(
+        self: "DictElement", _name: str, *_contents: Any, **_attributes: Any
+    ) -> None:
+        self.name = _name
+        self.contents = list(_contents)
+        self.attributes = _attributes
+        self._rendered_start: Optional[str] = None
+
+
+class DictStartTag:
+    def __init__(self: "DictStartTag", _name: str, **_kwargs: Any) -> None:
+        self.name = _name
+        self.attributes: Dict[str, Any] = _kwargs if _kwargs else {}
+        self._rendered_start: Optional[str] = None
+
+
+class DictEndTag:
+    def __init__(self: "DictEndTag", _name: str) -> None:
+        self.name = _name
+
+
+def traced_bytes(build: Callable[[], Any]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return after - before
+
+
+def many(node: Type, *args: Any) -> Callable[[], Any]:
+    return lambda: [node(*args) for _ in range(NODES)]
+
+
+def build_page(element: Type) -> Any:
+    # Each row makes 2 Elements (li, a) and a string
+    rows = NODES // 3
+    return element(
+        "ul",
+        *(element("li", element("a", f"Item {idx}", href="/")) for idx in range(rows)),
+    )
+
+
+def main() -> None:
+    cases: List[Any] = [
+        ("Element, no attributes", many(DictElement, "td"), many(Element, "td")),
+        (
+            "Element, 2 children",
+            many(DictElement, "td", "a", "b"),
+            many(Element, "td", "a", "b"),
+        ),
+        ("StartTag", many(DictStartTag, "td"), many(StartTag, "td")),
+        ("EndTag", many(DictEndTag, "td"), many(EndTag, "td")),
+        (
+            "ul/li/a page",
+            partial(build_page, DictElement),
+            partial(build_page, Element),
+        ),
+    ]
+    rows = [
+        (label, *(f"{traced_bytes(build) / NODES:.0f}" for build in (before, after)))
+        for label, before, after in cases
+    ]
+    print_table(
+        f"bytes per node ({NODES} nodes)",
+        ("nodes", "__dict__ bytes/node", "__slots__ bytes/node"),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Generating a sitemap of 50k entries with Namespace tags.
+
+``UncachedNamespace`` reproduces the previous ``Namespace``, which created a
+new Tag on every attribute lookup.
+"""
+
+from typing import Any
+
+from benchmarks.common import best_of, print_table
+from bmx.core import Namespace, Tag
+
+ENTRIES = 50000
+
+
+class UncachedNamespace:
+    def __init__(self: "UncachedNamespace", prefix: str = "") -> None:
+        self.prefix = prefix
+
+    def __getattr__(self: "UncachedNamespace", attr: str) -> Tag:
+        if attr.endswith("_"):
+            attr = attr[:-1]
+        return Tag(self.prefix + attr.replace("_", "-"))
+
+
+def sitemap(ns: Any) -> str:
+    return str(
+        +ns.urlset(xmlns="http://www.sitemaps.org/schemas/sitemap/0.9")
+        + (
+            +ns.url
+            + ns.loc
+            + f"https://example.com/page/{idx}"
+            - ns.loc
+            + ns.lastmod
+            + "2024-01-01"
+            - ns.lastmod
+            - ns.url
+            for idx in range(ENTRIES)
+        )
+        - ns.urlset
+    )
+
+
+def lookups(ns: Any) -> None:
+    for _ in range(ENTRIES):
+        ns.url, ns.loc, ns.lastmod
+
+
+def main() -> None:
+    namespaces = [
+        ("uncached (previous)", UncachedNamespace()),
+        ("cached", Namespace()),
+        ("vocabulary", Namespace(vocabulary=("urlset", "url", "loc", "lastmod"))),
+    ]
+    expected = sitemap(namespaces[0][1])
+    rows = []
+    for label, ns in namespaces:
+        assert sitemap(ns) == expected  # noqa: S101
+        rows.append(
+            (
+                label,
+                f"{best_of(lambda: lookups(ns)) * 1e3:.1f}",
+                f"{best_of(lambda: sitemap(ns), repeat=3) * 1e3:.0f}",
+            )
+        )
+    print_table(
+        f"sitemap of {ENTRIES} entries",
+        ("namespace", "ms/150k lookups", "ms/sitemap"),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Serializing a dashboard of large tables with render_parallel.
+
+Compares ``str()`` with process and thread pools, whose workers are started
+before timing. Parts sent to a process pool are pickled, and threads cannot
+run the pure Python serialization on more than one core.
+"""
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import os
+from typing import Any
+
+from benchmarks.common import best_of, print_table
+from bmx.htmltags import body, div, html, table, td, tr
+from bmx.parallel import render_parallel
+
+WIDGETS = 16
+ROWS = 500
+COLUMNS = 10
+
+
+def dashboard() -> Any:
+    def widget(idx: int) -> Any:
+        rows = (
+            +tr + [+td + f"{idx}:{row},{col}" - td for col in range(COLUMNS)] - tr
+            for row in range(ROWS)
+        )
+        return +div(class_="widget") + table + rows - table - div
+
+    return +html + body + [widget(idx) for idx in range(WIDGETS)] - body - html
+
+
+def timed(page: Any, executor: Executor) -> float:
+    with executor:
+        # Start the workers before timing
+        list(executor.map(abs, range(64)))
+        return best_of(lambda: render_parallel(page, executor), repeat=3)
+
+
+def main() -> None:
+    page = dashboard()
+    serial = best_of(lambda: str(page), repeat=3)
+    rows = [("str()", 1, f"{serial * 1e3:.1f}", "1.00x")]
+    cpus = os.cpu_count() or 1
+    workers = sorted({1, 2, 4, cpus} & set(range(1, cpus + 1)))
+    for count in workers:
+        elapsed = timed(page, ProcessPoolExecutor(max_workers=count))
+        rows.append(
+            ("processes", count, f"{elapsed * 1e3:.1f}", f"{serial / elapsed:.2f}x")
+        )
+    elapsed = timed(page, ThreadPoolExecutor(max_workers=cpus))
+    rows.append(("threads", cpus, f"{elapsed * 1e3:.1f}", f"{serial / elapsed:.2f}x"))
+    print_table(
+        f"{WIDGETS} tables of {ROWS}x{COLUMNS} cells, {cpus} cores",
+        ("render", "workers", "ms", "speedup"),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
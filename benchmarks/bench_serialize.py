@@ -0,0 +1,70 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Serialization of deep and wide trees.
+
+``recursive_str`` reproduces the previous ``Element.__str__``, which
+stringified every child and joined each level separately.
+"""
+
+import sys
+from typing import Any
+
+from benchmarks.common import best_of, print_table
+from bmx.core import Element, Fragment
+
+
+def recursive_str(node: Any) -> str:
+    if isinstance(node, Element):
+        return "".join(
+            (
+                node._render_start(),
+                *map(recursive_str, node.contents),
+                node._render_end(),
+            )
+        )
+    elif isinstance(node, Fragment):
+        return "".join(map(recursive_str, node))
+    return str(node)
+
+
+def deep_tree(depth: int) -> Element:
+    node = Element("span", "leaf")
+    for _ in range(depth - 1):
+        node = Element("div", "text", node, class_="level")
+    return node
+
+
+def wide_tree(width: int) -> Element:
+    return Element("ul", *(Element("li", f"Item {idx}") for idx in range(width)))
+
+
+def timed(func: Any, node: Any) -> str:
+    try:
+        return f"{best_of(lambda: func(node), repeat=3) * 1e3:.2f}"
+    except RecursionError:
+        return "RecursionError"
+
+
+def main() -> None:
+    cases = [
+        ("deep", 100, deep_tree(100)),
+        ("deep", 1_000, deep_tree(1_000)),
+        ("deep", 10_000, deep_tree(10_000)),
+        ("wide", 10_000, wide_tree(10_000)),
+        ("wide", 100_000, wide_tree(100_000)),
+    ]
+    rows = [
+        (shape, size, timed(recursive_str, node), timed(str, node))
+        for shape, size, node in cases
+    ]
+    print_table(
+        f"str() (recursion limit {sys.getrecursionlimit()})",
+        ("shape", "size", "recursive ms", "explicit stack ms"),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Rendering a page around a large navigation bar built each time or static."""
+
+from benchmarks.common import best_of, print_table
+from bmx import static
+from bmx.core import Fragment
+from bmx.htmltags import a, body, html, li, main as main_, nav, p, ul
+
+SIZES = (10, 100, 1_000)
+CALLS = 100
+
+
+def navigation(size: int) -> Fragment:
+    links = (+li + a(href=f"/{idx}") + f"Page {idx}" - a - li for idx in range(size))
+    return +nav + ul + links - ul - nav
+
+
+def page(navigation: object, content: str) -> str:
+    return str(
+        +html + body + navigation + main_ + p + content - p - main_ - body - html
+    )
+
+
+def main() -> None:
+    rows = []
+    for size in SIZES:
+        frozen = static(navigation(size))
+        rebuilt = best_of(lambda: [page(navigation(size), "x") for _ in range(CALLS)])
+        cached = best_of(lambda: [page(frozen, "x") for _ in range(CALLS)])
+        rows.append(
+            (
+                size,
+                f"{rebuilt / CALLS * 1e6:.1f}",
+                f"{cached / CALLS * 1e6:.1f}",
+                f"{rebuilt / cached:.0f}x",
+            )
+        )
+    print_table(
+        "static navigation",
+        ("links", "rebuilt us/page", "static us/page", "speedup"),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Large tables: start tags rendered once per Tag template vs once per Element."""
+
+from typing import Any, List
+
+from benchmarks.common import best_of, print_table
+from bmx.core import Element, Fragment
+from bmx.htmltags import table, td, tr
+
+COLUMNS = 10
+
+cell = td(class_="cell", data_format="number")
+
+
+def build_table(cells: int) -> Fragment:
+    return (
+        +table
+        + (
+            +tr + (+cell + str(col) - cell for col in range(COLUMNS)) - tr
+            for _ in range(cells // COLUMNS)
+        )
+        - table
+    )
+
+
+def all_elements(node: Any) -> List[Element]:
+    found = []
+    stack = list(node)
+    while stack:
+        item = stack.pop()
+        if isinstance(item, Element):
+            found.append(item)
+            stack.extend(item.contents)
+    return found
+
+
+def main() -> None:
+    rows = []
+    for cells in (10_000, 100_000):
+        page = build_table(cells)
+        elements = all_elements(page)
+
+        def uncached() -> None:
+            for element in elements:
+                element._rendered_start = None
+            str(page)
+
+        rows.append(
+            (
+                cells,
+                f"{best_of(uncached, repeat=3) * 1e3:.2f}",
+                f"{best_of(lambda: str(page), repeat=3) * 1e3:.2f}",
+            )
+        )
+    print_table(
+        "str() of a table", ("cells", "render every tag ms", "cached tags ms"), rows
+    )
+
+
+if __name__ == "__main__":
+    main()
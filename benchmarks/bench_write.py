@@ -0,0 +1,73 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Peak memory and time writing a sitemap to a file, beyond the tree itself."""
+
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from benchmarks.common import print_table
+from bmx.core import Namespace
+
+SIZES = (10_000, 100_000)
+
+xml = Namespace()
+
+
+def sitemap(size: int) -> Any:
+    urls = (
+        +xml.url
+        + xml.loc
+        + f"https://example.com/page/{idx}"
+        - xml.loc
+        + xml.lastmod
+        + "2021-01-01"
+        - xml.lastmod
+        - xml.url
+        for idx in range(size)
+    )
+    return (
+        +xml.urlset(xmlns="http://www.sitemaps.org/schemas/sitemap/0.9")
+        + urls
+        - xml.urlset
+    )
+
+
+def measure(write: Callable[[Any], None], mode: str) -> Any:
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "sitemap.xml"), mode) as fp:
+            tracemalloc.start()
+            try:
+                start = time.perf_counter()
+                write(fp)
+                elapsed = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    return f"{peak / 1024:,.0f}", f"{elapsed * 1e3:.0f}"
+
+
+def main() -> None:
+    rows = []
+    for size in SIZES:
+        page = sitemap(size)
+        cases = (
+            (
+                "fp.write(str(page).encode())",
+                "wb",
+                lambda fp: fp.write(str(page).encode()),
+            ),
+            ("page.write_to(binary)", "wb", page.write_to),
+            ("page.write_to(text)", "w", page.write_to),
+        )
+        for label, mode, write in cases:
+            rows.append((label, size, *measure(write, mode)))
+    print_table("sitemap", ("write", "urls", "peak KiB", "ms (traced)"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Small helpers shared by the benchmark scripts.
+
+Run a benchmark from the top-level source directory, eg.::
+
+    python -m benchmarks.bench_fragment
+"""
+
+import timeit
+from typing import Any, Callable, Sequence
+
+
+def best_of(func: Callable[[], Any], repeat: int = 5, number: int = 1) -> float:
+    """Return the best time, in seconds, of a single call to func."""
+    timer = timeit.Timer(func)
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def print_table(
+    title: str, headers: Sequence[str], rows: Sequence[Sequence[Any]]
+) -> None:
+    cells = [[str(cell) for cell in row] for row in rows]
+    widths = [
+        max(len(header), *(len(row[idx]) for row in cells))
+        for idx, header in enumerate(headers)
+    ]
+    print(title)
+    print("  ".join(header.rjust(width) for header, width in zip(headers, widths)))
+    for row in cells:
+        print("  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
+    print()
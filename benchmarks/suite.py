@@ -0,0 +1,236 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Benchmark suite with regression checks against a stored baseline.
+
+Run it from the top-level source directory, or with ``nox -s benchmarks``::
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+
+Each case is timed at several sizes. Times are also divided by the time of a
+fixed pure Python workload, which makes them comparable between machines, and
+a case fails when its relative time exceeds the baseline by more than the
+threshold. A case which grows faster than its input, eg. a quadratic
+``Fragment``, fails at its larger sizes. Times also differ between versions
+of Python and of BMX's dependencies, eg. MarkupSafe, which escapes strings,
+so compare with a baseline recorded in the environment that the
+``benchmarks`` nox session builds. The suite warns when the versions differ.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+from functools import partial
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from bmx.core import Component, Element, Fragment
+from bmx.htmltags import a, div, img, li, p, span, ul
+
+# Default allowed slowdown against the baseline, 0.3 is 30% slower
+DEFAULT_THRESHOLD = 0.3
+
+# Time spent measuring each case, in seconds
+MIN_TIME = 0.05
+
+# Distributions whose versions are recorded with the results
+DEPENDENCIES = ("MarkupSafe",)
+
+# Times a case which looks slower than the baseline is measured again, as a
+# single measurement can be slowed down by anything else running at the time
+RETRIES = 2
+
+_Setup = Callable[[int], Callable[[], Any]]
+
+_cases: List[Tuple[str, Sequence[int], _Setup]] = []
+
+
+def case(name: str, sizes: Sequence[int] = (100, 1000, 10000)) -> Callable:
+    """Register a benchmark, setup(size) returns the function to time."""
+
+    def register(setup: _Setup) -> _Setup:
+        _cases.append((name, sizes, setup))
+        return setup
+
+    return register
+
+
+@case("build_chain")
+def build_chain(size: int) -> Callable[[], Any]:
+    def build() -> Any:
+        f = +ul
+        for idx in range(size):
+            f = f + li + "item" - li
+        return f - ul
+
+    return build
+
+
+@case("build_iterable")
+def build_iterable(size: int) -> Callable[[], Any]:
+    return lambda: +ul + (+li + str(idx) - li for idx in range(size)) - ul
+
+
+@case("serialize_deep", sizes=(100, 1000, 5000))
+def serialize_deep(size: int) -> Callable[[], Any]:
+    node = Element("span", "leaf")
+    for _ in range(size - 1):
+        node = Element("div", "text", node, class_="level")
+    return lambda: str(node)
+
+
+@case("serialize_wide")
+def serialize_wide(size: int) -> Callable[[], Any]:
+    node = Element("ul", *(Element("li", f"Item {idx}") for idx in range(size)))
+    return lambda: str(node)
+
+
+@case("attributes")
+def attributes(size: int) -> Callable[[], Any]:
+    return lambda: str(
+        +div
+        + (
+            +a(href=f"/item/{idx}", class_="link item", data_id=idx, title="Item")
+            + img(src=f"/img/{idx}.png", alt="", width=32, height=32)
+            - a
+            for idx in range(size)
+        )
+        - div
+    )
+
+
+@case("escape")
+def escape(size: int) -> Callable[[], Any]:
+    values = [f"<b>{idx}</b> & 'more'" if idx % 4 else str(idx) for idx in range(size)]
+    return lambda: str(Fragment() + values)
+
+
+@case("component")
+def component(size: int) -> Callable[[], Any]:
+    @Component
+    def card(*contents: Any, title: str = "", **attributes: Any) -> Any:
+        return +div(class_="card") + span + title - span + p + contents - p - div
+
+    return lambda: str(
+        +div + (+card(title=str(idx)) + "Text" - card for idx in range(size)) - div
+    )
+
+
+def _time(func: Callable[[], Any], repeat: int = 5) -> float:
+    timer = timeit.Timer(func)
+    number = 1
+    while timer.timeit(number) < MIN_TIME / repeat:
+        number *= 2
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def _calibration() -> None:
+    total = 0
+    for idx in range(100000):
+        total += len(str(idx))
+
+
+def _setups(names: Sequence[str]) -> Dict[str, Callable[[], Callable[[], Any]]]:
+    return {
+        f"{name}[{size}]": partial(setup, size)
+        for name, sizes, setup in _cases
+        if not names or name in names
+        for size in sizes
+    }
+
+
+def measure(
+    setups: Dict[str, Callable[[], Callable[[], Any]]], calibration: float
+) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for key, setup in setups.items():
+        seconds = _time(setup())
+        results[key] = {"seconds": seconds, "relative": seconds / calibration}
+        print(f"{key}: {seconds * 1e3:.3f} ms", file=sys.stderr)
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Any], threshold: float
+) -> Dict[str, float]:
+    """Return the cases slower than the baseline by over threshold, and by how much."""
+    ratios = {
+        key: result["relative"] / baseline["results"][key]["relative"]
+        for key, result in results.items()
+        if key in baseline["results"]
+    }
+    return {key: ratio for key, ratio in ratios.items() if ratio > 1 + threshold}
+
+
+def versions() -> Dict[str, str]:
+    try:
+        from importlib.metadata import version
+    except ImportError:  # Python < 3.8, which the nox session does not use
+        return {}
+    return {name: version(name) for name in DEPENDENCIES}
+
+
+def check_versions(baseline: Dict[str, Any]) -> None:
+    """Warn about versions which differ from those the baseline was recorded with."""
+    recorded = {"Python": baseline["python"], **baseline.get("dependencies", {})}
+    current = {"Python": platform.python_version(), **versions()}
+    for name, version in sorted(recorded.items()):
+        # Only the major and minor versions of Python change its speed much
+        if name == "Python":
+            differ = version.split(".")[:2] != current[name].split(".")[:2]
+        else:
+            differ = version != current.get(name)
+        if differ:
+            print(
+                f"The baseline was recorded with {name} {version},"
+                f" not {current.get(name)}",
+                file=sys.stderr,
+            )
+
+
+def main(argv: Sequence[str] = ()) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cases", nargs="*", help="names of the cases to run")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with this JSON file")
+    parser.add_argument("--save-baseline", help="write a new baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv or None)
+    setups = _setups(args.cases)
+    calibration = _time(_calibration)
+    results = measure(setups, calibration)
+    regressions: Dict[str, float] = {}
+    if args.baseline:
+        with open(args.baseline) as fp:
+            baseline = json.load(fp)
+        check_versions(baseline)
+        regressions = compare(results, baseline, args.threshold)
+        for _ in range(RETRIES):
+            if not regressions:
+                break
+            retried = measure({key: setups[key] for key in regressions}, calibration)
+            for key, result in retried.items():
+                if result["seconds"] < results[key]["seconds"]:
+                    results[key] = result
+            regressions = compare(results, baseline, args.threshold)
+    summary = {
+        "python": platform.python_version(),
+        "dependencies": versions(),
+        "calibration": calibration,
+        "results": results,
+    }
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as fp:
+                json.dump(summary, fp, indent=2, sort_keys=True)
+    for key, ratio in sorted(regressions.items()):
+        print(f"{key} is {ratio:.2f}x slower than the baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
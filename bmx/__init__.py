@@ -0,0 +1,48 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+import sys
+from typing import Any, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .cache import FragmentCache, LRU
+    from .compiler import compile
+    from .core import cached, Lazy, static
+    from .profiling import profile
+
+# The module of each export, which is only imported when the export is first
+# used, so that eg. "from bmx.htmltags import div" does not import them all
+_EXPORTS = {
+    "FragmentCache": "cache",
+    "LRU": "cache",
+    "Lazy": "core",
+    "cached": "core",
+    "compile": "compiler",
+    "profile": "profiling",
+    "static": "core",
+}
+
+__all__ = ["FragmentCache", "LRU", "Lazy", "cached", "compile", "profile", "static"]
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    from importlib import import_module
+
+    value = getattr(import_module(f".{module}", __name__), name)
+    # Later lookups find the export in the module, without calling __getattr__
+    return globals().setdefault(name, value)
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *_EXPORTS})
+
+
+# Module __getattr__ is new in Python 3.7
+if sys.version_info < (3, 7):
+    for _name in _EXPORTS:
+        __getattr__(_name)
@@ -0,0 +1,116 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Render markup containing awaitables, eg. from ``async def`` Components.
+
+Coroutines, futures and async generators can be added to Fragments, or be
+returned by Component functions. ``render_async`` serializes such markup for
+an ASGI server::
+
+    async def app(scope, receive, send):
+        ...
+        async for chunk in render_async(page):
+            await send({"type": "http.response.body", "body": chunk.encode(),
+                        "more_body": True})
+
+The result of an awaitable, and every item of an async generator, is added to
+the page as if it had been added to a Fragment, so strings are escaped.
+"""
+
+import asyncio
+from collections.abc import AsyncIterable, Awaitable
+from typing import Any, AsyncIterator, Dict, Iterator, List
+
+from .core import DEFAULT_CHUNK_SIZE, Element, Fragment, Lazy
+
+
+def _awaitables(node: Any) -> Iterator[Awaitable]:
+    stack: List[Iterator[Any]] = [iter((node,))]
+    while stack:
+        for item in stack[-1]:
+            if isinstance(item, str):
+                continue
+            elif isinstance(item, Element):
+                stack.append(iter(item.contents))
+                break
+            elif isinstance(item, Fragment):
+                stack.append(iter(item._contents))
+                break
+            elif isinstance(item, Awaitable):
+                yield item
+        else:
+            stack.pop()
+
+
+def _start_tasks(node: Any) -> Dict[int, asyncio.Future]:
+    # An awaitable added more than once is only awaited once
+    tasks: Dict[int, asyncio.Future] = {}
+    for awaitable in _awaitables(node):
+        if id(awaitable) not in tasks:
+            tasks[id(awaitable)] = asyncio.ensure_future(awaitable)
+    return tasks
+
+
+async def _values(item: Any, tasks: Dict[int, asyncio.Future]) -> AsyncIterator[Any]:
+    if isinstance(item, Awaitable):
+        yield await tasks[id(item)]
+    elif isinstance(item, Lazy):
+        for value in item._consume():
+            yield value
+    else:
+        async for value in item:
+            yield value
+
+
+async def _iter_markup(node: Any) -> AsyncIterator[str]:
+    # Start every awaitable in node before serializing any of it, so that they
+    # run concurrently, and then await each one where it is in the document
+    tasks = _start_tasks(node)
+    try:
+        stack: List[Iterator[Any]] = [iter((node,))]
+        while stack:
+            for item in stack[-1]:
+                if isinstance(item, str):
+                    yield item
+                elif isinstance(item, Element):
+                    yield item._render_start()
+                    stack.append(iter((item._render_end(),)))
+                    stack.append(iter(item.contents))
+                    break
+                elif isinstance(item, Fragment):
+                    stack.append(iter(item._contents))
+                    break
+                elif isinstance(item, (Awaitable, AsyncIterable, Lazy)):
+                    async for value in _values(item, tasks):
+                        async for piece in _iter_markup(Fragment() + value):
+                            yield piece
+                else:
+                    yield str(item)
+            else:
+                stack.pop()
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+
+async def render_async(
+    node: Any, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> AsyncIterator[str]:
+    """Serialize node as a series of strings, awaiting its awaitables.
+
+    All the awaitables in node are run concurrently, and any that their
+    results contain as soon as those are available. Chunks of about chunk_size
+    characters are yielded in document order as soon as they are complete.
+    """
+    buffer: List[str] = []
+    size = 0
+    async for piece in _iter_markup(node):
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer)
@@ -0,0 +1,128 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Render one template for many records, eg. static pages or email bodies.
+
+A template decorated with :func:`bmx.compile` builds its markup once, and
+each record only fills in the values. Any other template is called for each
+record, so parts shared by every record are best made :func:`bmx.static`,
+which renders them once. Records can be shared between processes, in which
+case the template, the records and any ``path`` function must be picklable,
+ie. defined at the top level of a module.
+"""
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Optional
+
+from markupsafe import Markup
+
+from .compiler import Compiled
+
+# Number of records sent to a worker process at a time
+DEFAULT_BATCH_SIZE = 100
+
+
+def _render(template: Callable, record: Any) -> Markup:
+    return Markup(str(template(record)))
+
+
+def _template(template: Callable) -> Callable[[Any], Markup]:
+    # Only templates decorated with bmx.compile are compiled, as the compiler
+    # cannot trace every template, eg. one that tests a value with "is None"
+    if isinstance(template, Compiled):
+        return template
+    return partial(_render, template)
+
+
+def _render_batch(template: Callable, records: List[Any]) -> List[Markup]:
+    render = _template(template)
+    return [render(record) for record in records]
+
+
+def _write_batch(
+    template: Callable,
+    path: Callable[[Any], Any],
+    encoding: str,
+    records: Iterable[Any],
+) -> int:
+    render = _template(template)
+    count = 0
+    for record in records:
+        with open(path(record), "w", encoding=encoding) as fp:
+            fp.write(render(record))
+        count += 1
+    return count
+
+
+def _batches(records: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+    records = iter(records)
+    batch = list(islice(records, batch_size))
+    while batch:
+        yield batch
+        batch = list(islice(records, batch_size))
+
+
+def _map_batches(
+    func: Callable, records: Iterable[Any], processes: int, batch_size: int, *args: Any
+) -> Iterator[Any]:
+    """Yield func(*args, batch) for each batch of records, in order."""
+    # Only a few batches per process are pending at a time, so that records
+    # are read and results are returned as the work goes on
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        pending: Deque[Future] = deque()
+        for batch in _batches(records, batch_size):
+            pending.append(executor.submit(func, *args, batch))
+            if len(pending) >= 2 * processes:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def render_many(
+    template: Callable,
+    records: Iterable[Any],
+    processes: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[Markup]:
+    """Render template(record) for each record, in order.
+
+    Pages are yielded as they are rendered, so they can be passed on to any
+    sink, eg. ``for page in render_many(email, users): outbox.send(page)``.
+    With processes, records are rendered in that many worker processes.
+    """
+    if not processes:
+        render = _template(template)
+        return (render(record) for record in records)
+    return (
+        page
+        for pages in _map_batches(
+            _render_batch, records, processes, batch_size, template
+        )
+        for page in pages
+    )
+
+
+def write_many(
+    template: Callable,
+    records: Iterable[Any],
+    path: Callable[[Any], Any],
+    processes: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    encoding: str = "utf-8",
+) -> int:
+    """Write template(record) to the file path(record) for each record.
+
+    With processes, the files are written by that many worker processes, so
+    the pages are not sent back to this one. Returns the number of files.
+    """
+    if not processes:
+        return _write_batch(template, path, encoding, records)
+    return sum(
+        _map_batches(
+            _write_batch, records, processes, batch_size, template, path, encoding
+        )
+    )
@@ -0,0 +1,163 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Caches for rendered markup."""
+
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable, Iterable, Optional, Tuple
+
+
+class CacheBackend(ABC):
+    """Storage for cached markup.
+
+    Implement get and set to keep cached markup somewhere else than in this
+    process, eg. in a store shared by several servers. Keys are hashable
+    tuples of strings and of the keys given to ``bmx.cached``, and values are
+    picklable.
+    """
+
+    @abstractmethod
+    def get(self: "CacheBackend", key: Hashable, default: Any = None) -> Any:
+        """Return the value stored for key, or default."""
+
+    @abstractmethod
+    def set(
+        self: "CacheBackend", key: Hashable, value: Any, ttl: Optional[float] = None
+    ) -> None:
+        """Store value for key, for ttl seconds or until it is evicted."""
+
+
+class LRU(CacheBackend):
+    """Keep the maxsize most recently used entries.
+
+    Entries can be given a time to live, in seconds, after which they are
+    dropped. ``hits``, ``misses`` and ``evictions`` count what happened to
+    lookups and entries, for monitoring; an expired entry counts as a miss.
+    """
+
+    def __init__(self: "LRU", maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Optional[float], Any]]"
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self: "LRU", key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires is None or expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(
+        self: "LRU", key: Hashable, value: Any, ttl: Optional[float] = None
+    ) -> None:
+        expires = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self: "LRU") -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def hit_ratio(self: "LRU") -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self: "LRU") -> int:
+        return len(self._entries)
+
+    def __repr__(self: "LRU") -> str:
+        return (
+            f"<LRU maxsize={self.maxsize} size={len(self)} hits={self.hits}"
+            f" misses={self.misses} evictions={self.evictions}>"
+        )
+
+
+class FragmentCache:
+    """Rendered regions of pages, stored in a backend (an ``LRU`` by default).
+
+    Regions can be given tags, and ``invalidate(tag)`` drops every region
+    with that tag. Each tag has a version stored in the backend next to the
+    regions, which record the versions of their tags when they were stored,
+    so invalidating a tag does not need to find its regions, and works for
+    any backend.
+    """
+
+    def __init__(self: "FragmentCache", backend: Optional[CacheBackend] = None) -> None:
+        self.backend = LRU(maxsize=1024) if backend is None else backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+
+    def _versions(self: "FragmentCache", tags: Iterable[str]) -> Tuple[str, ...]:
+        versions = []
+        for tag in tags:
+            version = self.backend.get(("bmx.tag", tag))
+            if version is None:
+                # A tag whose version was evicted gets a new one, so regions
+                # stored before it was invalidated can never match it again
+                version = os.urandom(16).hex()
+                self.backend.set(("bmx.tag", tag), version)
+            versions.append(version)
+        return tuple(versions)
+
+    def get(
+        self: "FragmentCache", key: Hashable, tags: Iterable[str] = ()
+    ) -> Optional[str]:
+        """Return the region stored for key, or None if it is missing."""
+        entry = self.backend.get(("bmx.region", key))
+        hit = entry is not None and entry[0] == self._versions(tags)
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return entry[1] if hit else None
+
+    def set(
+        self: "FragmentCache",
+        key: Hashable,
+        value: str,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        self.backend.set(("bmx.region", key), (self._versions(tags), value), ttl)
+
+    def invalidate(self: "FragmentCache", *tags: str) -> None:
+        """Drop every region stored with any of the tags."""
+        for tag in tags:
+            self.backend.set(("bmx.tag", tag), os.urandom(16).hex())
+
+    @property
+    def hit_ratio(self: "FragmentCache") -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __repr__(self: "FragmentCache") -> str:
+        return (
+            f"<FragmentCache backend={self.backend!r} hits={self.hits}"
+            f" misses={self.misses}>"
+        )
+
+
+# Used by bmx.cached unless it is given another cache
+fragment_cache = FragmentCache()
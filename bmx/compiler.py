@@ -0,0 +1,468 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Compile functions that build BMX markup into string templates.
+
+``compile`` calls a function once with placeholders ("holes") in place of its
+arguments. Everything the function renders around the holes is static, so the
+output is cut into fixed strings and slots for the dynamic values. Calling the
+compiled function only fills the slots and joins the strings.
+
+Holes support what markup usually does with an argument: adding it to a
+Fragment, formatting it in an f-string, using it as an attribute value,
+reading its attributes or items (``item.href``, ``row["name"]``) and looping
+over it, eg. ``+(+li +item.caption -li for item in navigation)``. A loop is
+found by tracing the function again with the loop left empty, and checked by
+tracing it with two items, whose markup may only differ in the items' values,
+so that eg. a counter from ``enumerate`` is not compiled as a constant.
+
+Anything else, like testing an argument in an ``if``, comparing it, passing
+it to ``Markup`` or calling a string method on it, cannot be traced. Neither
+can identity and type checks, ie. ``is``, ``isinstance`` and ``type``, so a
+function which uses them is not traced at all. The function is then called as
+usual every time. Values are rendered as BMX renders them: escaped in content
+and left as they are in attribute values. Identity and type checks in the
+functions that a compiled function calls, and string methods called on text
+that an argument was formatted into, eg. ``f"Hello {name}".strip()``, cannot
+always be detected, so functions whose markup depends on them should not be
+compiled.
+"""
+
+import dis
+import inspect
+import re
+from functools import update_wrapper
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from markupsafe import escape, Markup
+
+from .core import _escape, _render_attributes, Fragment
+
+# Path to a value: the name of an argument, or the index of a loop for the
+# loop's item, followed by ("attr", name) and ("key", key) steps
+_Path = Tuple[Any, ...]
+
+# Markers contain cased letters, so that changing their case breaks them
+_MARKER = re.compile("(\ue000[0-9]+xX\ue001)")
+_ATTRIBUTE_START = re.compile(r' ([^\s"\'>/=]+)="$')
+
+# Builtins whose result for a hole is not their result for the argument
+_TYPE_CHECKS = {"isinstance", "issubclass", "type"}
+
+
+class _Untraceable(Exception):
+    pass
+
+
+class _Tracer:
+    def __init__(self: "_Tracer") -> None:
+        # Hole keys are numbered in order of first use, so that the same hole
+        # has the same marker in every run
+        self.markers: Dict[Tuple[Any, ...], str] = {}
+        self.keys: Dict[str, Tuple[Any, ...]] = {}
+        self.loops: List[_Path] = []
+        self.empty_loop: Optional[int] = None
+        self.doubled_loop: Optional[int] = None
+
+    def marker(self: "_Tracer", key: Tuple[Any, ...]) -> str:
+        marker = self.markers.get(key)
+        if marker is None:
+            marker = self.markers[key] = f"\ue000{len(self.markers)}xX\ue001"
+            self.keys[marker] = key
+        return _Marker(marker)
+
+    def iterate(self: "_Tracer", path: _Path) -> Iterator["_Hole"]:
+        # Arguments are named, and loop items are not
+        if not isinstance(path[0], str):
+            raise _Untraceable("Nested loops cannot be compiled")
+        index = len(self.loops)
+        self.loops.append(path)
+        if index == self.empty_loop:
+            return iter(())
+        if index == self.doubled_loop:
+            return iter((_Hole(self, (index,)), _Hole(self, (_second(index),))))
+        return iter((_Hole(self, (index,)),))
+
+    def run(
+        self: "_Tracer",
+        func: Callable,
+        signature: inspect.Signature,
+        empty_loop: Optional[int] = None,
+        doubled_loop: Optional[int] = None,
+    ) -> str:
+        self.loops = []
+        self.empty_loop = empty_loop
+        self.doubled_loop = doubled_loop
+        args = []
+        kwargs = {}
+        for name, parameter in signature.parameters.items():
+            hole = _Hole(self, (name,))
+            if parameter.kind is parameter.KEYWORD_ONLY:
+                kwargs[name] = hole
+            elif parameter.kind in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD):
+                raise _Untraceable("*args and **kwargs cannot be compiled")
+            else:
+                args.append(hole)
+        return str(func(*args, **kwargs))
+
+
+def _second(index: int) -> Tuple[str, int]:
+    # Path of the second item of a loop traced with two items
+    return ("second", index)
+
+
+class _Marker(str):
+    """Returned by str(hole), a marker whose value cannot be used while tracing.
+
+    The real value would give a different result to all of these, eg. a
+    slice or ``upper()`` of the marker does not render the value sliced.
+    """
+
+    __slots__ = ()
+
+    def _untraceable(self: "_Marker", *args: Any, **kwargs: Any) -> Any:
+        raise _Untraceable("Cannot compile a string operation on an argument")
+
+    __getitem__ = __iter__ = __len__ = __contains__ = _untraceable
+    __mul__ = __rmul__ = __mod__ = __rmod__ = _untraceable
+    __eq__ = __ne__ = __lt__ = __le__ = __gt__ = __ge__ = _untraceable  # type: ignore
+    __hash__ = str.__hash__
+
+
+for _name in dir(str):
+    if not _name.startswith("_"):
+        setattr(_Marker, _name, _Marker._untraceable)
+
+
+class _Hole:
+    """Stands in for an argument, or a value reached from one, while tracing."""
+
+    __slots__ = ("_tracer", "_path")
+
+    def __init__(self: "_Hole", tracer: _Tracer, path: _Path) -> None:
+        self._tracer = tracer
+        self._path = path
+
+    def __getattr__(self: "_Hole", name: str) -> "_Hole":
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return _Hole(self._tracer, self._path + (("attr", name),))
+
+    def __getitem__(self: "_Hole", key: Any) -> "_Hole":
+        return _Hole(self._tracer, self._path + (("key", key),))
+
+    def __iter__(self: "_Hole") -> Iterator["_Hole"]:
+        return self._tracer.iterate(self._path)
+
+    def __str__(self: "_Hole") -> str:
+        return self._tracer.marker(("str", self._path))
+
+    def __repr__(self: "_Hole") -> str:
+        return self._tracer.marker(("repr", self._path))
+
+    def __format__(self: "_Hole", format_spec: str) -> str:
+        return self._tracer.marker(("format", self._path, format_spec))
+
+    def _untraceable(self: "_Hole", *args: Any, **kwargs: Any) -> Any:
+        raise _Untraceable(f"Cannot compile an operation on argument {self._path}")
+
+    __bool__ = __len__ = __call__ = __contains__ = __html__ = _untraceable
+    __eq__ = __ne__ = __lt__ = __le__ = __gt__ = __ge__ = _untraceable  # type: ignore
+    __hash__ = _untraceable  # type: ignore
+
+
+@Fragment.__add__.register(_Hole)  # type: ignore
+def _add_Hole(self: Fragment, other: _Hole) -> Fragment:
+    return self + Markup(other._tracer.marker(("content", other._path)))
+
+
+def _resolve(path: _Path, env: Dict[Any, Any]) -> Any:
+    value = env[path[0]]
+    for kind, key in path[1:]:
+        value = getattr(value, key) if kind == "attr" else value[key]
+    return value
+
+
+def _render_content(value: Any) -> str:
+    # Render a value as if it had been added to a Fragment
+    if type(value) is str:
+        return _escape(value)
+    return str(Fragment() + value)
+
+
+class _Slot:
+    __slots__ = ("path", "convert")
+
+    def __init__(self: "_Slot", path: _Path, convert: Callable[[Any], str]) -> None:
+        self.path = path
+        self.convert = convert
+
+    def render(self: "_Slot", env: Dict[Any, Any], out: List[str]) -> None:
+        out.append(self.convert(_resolve(self.path, env)))
+
+
+class _Loop:
+    __slots__ = ("index", "path", "parts")
+
+    def __init__(self: "_Loop", index: int, path: _Path, parts: List["_Part"]) -> None:
+        self.index = index
+        self.path = path
+        self.parts = parts
+
+    def render(self: "_Loop", env: Dict[Any, Any], out: List[str]) -> None:
+        for item in _resolve(self.path, env):
+            env[self.index] = item
+            _render(self.parts, env, out)
+
+
+_Part = Union[str, _Slot, _Loop]
+
+
+def _render(parts: List[_Part], env: Dict[Any, Any], out: List[str]) -> None:
+    for part in parts:
+        if isinstance(part, str):
+            out.append(part)
+        else:
+            part.render(env, out)
+
+
+def _converter(key: Tuple[Any, ...], in_tag: bool) -> Callable[[Any], str]:
+    # Values are escaped in content, but not in attributes, like in BMX
+    kind = key[0]
+    if kind == "content":
+        return _render_content
+    elif kind == "format":
+        format_spec = key[2]
+        if in_tag:
+            return lambda value: format(value, format_spec)
+        return lambda value: escape(format(value, format_spec))
+    elif kind == "repr":
+        return repr if in_tag else lambda value: escape(repr(value))
+    return str if in_tag else escape
+
+
+def _in_tag(tokens: List[str], tracer: _Tracer) -> List[bool]:
+    """Return whether each token is inside a start tag, eg. in an attribute."""
+    # Text is escaped, so any "<" in it starts a tag, while attribute values
+    # are quoted and not escaped, so they can contain ">"
+    result = []
+    in_tag = in_value = False
+    for token in tokens:
+        result.append(in_tag)
+        if token in tracer.keys:
+            continue
+        if in_value:
+            in_value = token != '"'
+        elif in_tag:
+            in_value = token == '"'
+            in_tag = token != ">"
+        else:
+            in_tag = token == "<"
+    return result
+
+
+def _attribute_converter(name: str) -> Callable[[Any], str]:
+    return lambda value: _render_attributes({name: value})
+
+
+def _parts(tokens: List[str], in_tag: List[bool], tracer: _Tracer) -> List[_Part]:
+    parts: List[_Part] = []
+    static: List[str] = []
+    for token, token_in_tag in zip(tokens, in_tag):
+        if token in tracer.keys:
+            if static:
+                parts.append("".join(static))
+                static = []
+            key = tracer.keys[token]
+            parts.append(_Slot(key[1], _converter(key, token_in_tag)))
+        elif token in "\ue000\ue001":
+            raise _Untraceable("An argument was changed as a string, eg. sliced")
+        else:
+            static.append(token)
+    if static:
+        parts.append("".join(static))
+
+    # A value rendered on its own as an attribute, ie. ' name="' value '"',
+    # renders the whole attribute, so that True, False, None and lists work
+    for idx, part in enumerate(parts):
+        if (
+            isinstance(part, _Slot)
+            and part.convert is str
+            and 0 < idx < len(parts) - 1
+            and isinstance(parts[idx - 1], str)
+            and isinstance(parts[idx + 1], str)
+            and parts[idx + 1].startswith('"')  # type: ignore
+        ):
+            match = _ATTRIBUTE_START.search(parts[idx - 1])  # type: ignore
+            if match:
+                name = match.group(1)
+                parts[idx - 1] = parts[idx - 1][: match.start()]  # type: ignore
+                parts[idx + 1] = parts[idx + 1][1:]  # type: ignore
+                part.convert = _attribute_converter(name)
+    return [part for part in parts if part != ""]
+
+
+def _tokenize(output: str) -> List[str]:
+    # Markers are single tokens and static text is split into characters
+    tokens = []
+    for idx, piece in enumerate(_MARKER.split(output)):
+        if idx % 2:
+            tokens.append(piece)
+        else:
+            tokens.extend(piece)
+    return tokens
+
+
+def _difference(tokens: List[str], shorter: List[str]) -> Tuple[int, int]:
+    """Return the start and end of the tokens that are missing from shorter."""
+    prefix = 0
+    while (
+        prefix < len(shorter)
+        and prefix < len(tokens)
+        and tokens[prefix] == shorter[prefix]
+    ):
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < len(shorter) - prefix and tokens[-1 - suffix] == shorter[-1 - suffix]
+    ):
+        suffix += 1
+    return prefix, len(tokens) - suffix
+
+
+def _second_token(token: str, index: int, tracer: _Tracer) -> str:
+    # The marker of the second item's value for the first item's marker
+    key = tracer.keys.get(token)
+    if key is None or key[1][0] != index:
+        return token
+    second_key = (key[0], (_second(index),) + key[1][1:], *key[2:])
+    return tracer.markers.get(second_key, "")
+
+
+def _check_code(code: Any) -> None:
+    """Raise _Untraceable if code checks the identity or type of a value."""
+    for instruction in dis.get_instructions(code):
+        # "is" is a COMPARE_OP before Python 3.9, and "is None" can be a jump
+        opname = instruction.opname
+        if (
+            opname == "IS_OP"
+            or opname.endswith(("_IF_NONE", "_IF_NOT_NONE"))
+            or (opname == "COMPARE_OP" and instruction.argval in ("is", "is not"))
+        ):
+            raise _Untraceable("Identity checks cannot be compiled")
+        if (
+            opname in ("LOAD_GLOBAL", "LOAD_NAME")
+            and instruction.argval in _TYPE_CHECKS
+        ):
+            raise _Untraceable("Type checks cannot be compiled")
+    # Nested functions, eg. generator expressions
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            _check_code(const)
+
+
+def _trace(func: Callable, signature: inspect.Signature) -> List[_Part]:
+    code = getattr(func, "__code__", None)
+    if code is not None:
+        _check_code(code)
+    tracer = _Tracer()
+    tokens = _tokenize(tracer.run(func, signature))
+    in_tag = _in_tag(tokens, tracer)
+    loops = tracer.loops
+
+    # Each loop's body is what disappears from the output when it is empty,
+    # and is repeated, with the second item's values, for two items
+    regions = []
+    for index, path in enumerate(loops):
+        empty = _tokenize(tracer.run(func, signature, empty_loop=index))
+        if len(tracer.loops) != len(loops):
+            raise _Untraceable("Nested loops cannot be compiled")
+        start, end = _difference(tokens, empty)
+        doubled = _tokenize(tracer.run(func, signature, doubled_loop=index))
+        second = [_second_token(token, index, tracer) for token in tokens[start:end]]
+        if doubled != tokens[:end] + second + tokens[end:]:
+            raise _Untraceable("Loop bodies differ by more than their items")
+        regions.append((start, end, index, path))
+
+    parts: List[_Part] = []
+    position = 0
+    for start, end, index, path in sorted(regions):
+        if start < position:
+            raise _Untraceable("Overlapping loops cannot be compiled")
+        parts.extend(_parts(tokens[position:start], in_tag[position:start], tracer))
+        body = _parts(tokens[start:end], in_tag[start:end], tracer)
+        _check_loop_items(body, index)
+        parts.append(_Loop(index, path, body))
+        position = end
+    parts.extend(_parts(tokens[position:], in_tag[position:], tracer))
+    _check_loop_items(parts, None)
+    return parts
+
+
+def _check_loop_items(parts: List[_Part], index: Optional[int]) -> None:
+    for part in parts:
+        if isinstance(part, _Slot) and isinstance(part.path[0], int):
+            if part.path[0] != index:
+                raise _Untraceable("Loop items must be used inside their loop")
+
+
+class Compiled:
+    """A function compiled by :func:`compile`.
+
+    Calling it returns the rendered markup as a ``Markup`` string, so the
+    result can be added to other BMX expressions without being escaped.
+    ``traced`` is False when the function could not be compiled and is
+    called as usual instead.
+    """
+
+    def __init__(self: "Compiled", func: Callable) -> None:
+        update_wrapper(self, func)
+        self._signature = inspect.signature(func)
+        self._parts: Optional[List[_Part]]
+        try:
+            self._parts = _trace(func, self._signature)
+        except Exception:
+            self._parts = None
+        self.traced = self._parts is not None
+
+    def _bind(self: "Compiled", args: Any, kwargs: Any) -> Dict[Any, Any]:
+        bound = self._signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return dict(bound.arguments)
+
+    def __call__(self: "Compiled", *args: Any, **kwargs: Any) -> Markup:
+        if self._parts is not None:
+            out: Optional[List[str]] = []
+            try:
+                _render(self._parts, self._bind(args, kwargs), out)  # type: ignore
+            except Exception:
+                # The arguments do not fit the traced markup, eg. an argument
+                # that was iterated over is None
+                out = None
+            if out is not None:
+                return Markup("".join(out))
+        return self.interpret(*args, **kwargs)
+
+    def __reduce__(self: "Compiled") -> str:
+        # Pickled by name, like the function it replaces, so that templates
+        # can be sent to other processes
+        return self.__qualname__  # type: ignore
+
+    def interpret(self: "Compiled", *args: Any, **kwargs: Any) -> Markup:
+        """Call the original function and render its result."""
+        return Markup(str(self.__wrapped__(*args, **kwargs)))  # type: ignore
+
+
+def compile(func: Callable) -> Compiled:
+    """Compile a function that returns BMX markup into a template.
+
+    Use as a decorator::
+
+        @compile
+        def greeter(name):
+            return +html +body +p +f"Hello {name}" -p -body -html
+
+        greeter("Stuart")  # Markup('<html><body><p>Hello Stuart</p></body></html>')
+    """
+    return Compiled(func)
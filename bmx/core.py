@@ -5,20 +5,99 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
 # from __future__ import annotations         # Uncomment when dropping support for Python 3.6
+import codecs
+import copyreg
+import io
+import re
+import sys
+import threading
 from abc import ABC, abstractmethod
-from collections.abc import Iterable, Sequence
+from collections.abc import AsyncIterable, Awaitable, Iterable, Sequence
 from enum import Enum
+from functools import partial, singledispatch, update_wrapper
 from reprlib import recursive_repr
-from typing import Any, Callable, List, Optional, Union
-
-from markupsafe import escape
-
-try:
-    # >=3.8
-    from functools import singledispatchmethod  # type: ignore
-except ImportError:
-    # <=3.7
-    from singledispatchmethod import singledispatchmethod  # type: ignore
+from types import MappingProxyType, MethodType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from markupsafe import escape, Markup
+
+from .cache import fragment_cache, FragmentCache, LRU
+
+# Target size, in characters, of the chunks yielded by iter_chunks
+DEFAULT_CHUNK_SIZE = 8192
+
+
+class typedispatchmethod:
+    """Dispatch a binary method on the type of its argument.
+
+    A replacement for ``functools.singledispatchmethod`` on hot paths. The
+    registry is a ``functools.singledispatch`` function, so resolution follows
+    the same MRO and ABC rules, but its result is memoized in a dict keyed by
+    the exact type of the argument. Once the owning class has been created,
+    the descriptor replaces itself with a plain function, so calling the
+    method costs one dict lookup instead of binding a new dispatcher.
+
+    Register more types with ``Owner.method.register(cls)``, exactly as with
+    ``singledispatchmethod``.
+    """
+
+    def __init__(self: "typedispatchmethod", func: Callable) -> None:
+        self.func = func
+        self.dispatcher = singledispatch(func)
+        self.cache: Dict[type, Callable] = {}
+
+    def register(
+        self: "typedispatchmethod", cls: type, method: Optional[Callable] = None
+    ) -> Callable:
+        self.cache.clear()
+        return self.dispatcher.register(cls, func=method)
+
+    def _make_method(self: "typedispatchmethod") -> Callable[[Any, Any], Any]:
+        cache = self.cache
+        dispatch = self.dispatcher.dispatch
+
+        def method(self: Any, other: Any) -> Any:
+            try:
+                impl = cache[type(other)]
+            except KeyError:
+                impl = cache[type(other)] = dispatch(type(other))
+            return impl(self, other)
+
+        def cached_dispatch(cls: type) -> Callable:
+            try:
+                return cache[cls]
+            except KeyError:
+                impl = cache[cls] = dispatch(cls)
+                return impl
+
+        update_wrapper(method, self.func)
+        method.register = self.register  # type: ignore
+        method.dispatch = cached_dispatch  # type: ignore
+        return method
+
+    def __set_name__(self: "typedispatchmethod", owner: type, name: str) -> None:
+        setattr(owner, name, self._make_method())
+
+    def __get__(
+        self: "typedispatchmethod", obj: Any, cls: Optional[type] = None
+    ) -> Callable[..., Any]:
+        # Only reached when assigned to a class after creation, when
+        # __set_name__ is not called
+        if obj is None:
+            return self._make_method()
+        return MethodType(self._make_method(), obj)
 
 
 class SelfClosingTagStyle(Enum):
@@ -30,6 +109,8 @@ class SelfClosingTagStyle(Enum):
 
 
 class AbstractTag(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def __add__(self: "AbstractTag", other: Any) -> "Fragment":
         raise BMXSyntaxError(
@@ -63,29 +144,126 @@ class AbstractTag(ABC):
         pass
 
 
+# Escaped strings of up to _ESCAPE_CACHE_MAX_LENGTH characters are kept, as
+# pages repeat the same labels, class names and numbers many times. The cache
+# is emptied when it reaches _ESCAPE_CACHE_SIZE entries.
+_ESCAPE_CACHE_SIZE = 4096
+_ESCAPE_CACHE_MAX_LENGTH = 64
+_escaped: Dict[str, Markup] = {}
+_needs_escaping = re.compile("[&<>\"']").search
+# Markup(value) without escaping it or going through Markup.__new__
+_markup = partial(str.__new__, Markup)
+
+
+def _escape(value: str) -> Markup:
+    """Escape a string like ``markupsafe.escape``, but faster for plain strings."""
+    if type(value) is not str:
+        # Markup and other types with an __html__ method
+        return escape(value)
+    result = _escaped.get(value)
+    if result is None:
+        result = escape(value) if _needs_escaping(value) else _markup(value)
+        if len(value) <= _ESCAPE_CACHE_MAX_LENGTH:
+            if len(_escaped) >= _ESCAPE_CACHE_SIZE:
+                _escaped.clear()
+            _escaped[value] = result
+    return result
+
+
+def _escape_all(values: Sequence[str]) -> List[Markup]:
+    """Escape many plain strings with a single call to ``markupsafe.escape``."""
+    pieces = str.split(escape("\0".join(values)), "\0")
+    if len(pieces) != len(values):
+        # Some of the strings contain the separator
+        return [_escape(value) for value in values]
+    return list(map(_markup, pieces))
+
+
+# Shared, read-only attributes of every node that has none
+_NO_ATTRIBUTES: Mapping[str, Any] = MappingProxyType({})
+
+# Attribute keys with any trailing underscore removed, ie. for_, id_, class_
+_attribute_names: Dict[str, str] = {}
+
+
+def _render_attributes(attributes: Mapping[str, Any]) -> str:
+    """Render attributes as the string that follows a tag's name.
+
+    True renders the bare attribute name, False and None leave the attribute
+    out and lists are joined with spaces, eg. for classes. Nodes call this
+    once and keep the result, as their attributes are not changed after they
+    are created.
+    """
+    if not attributes:
+        return ""
+    rendered = []
+    for key, value in attributes.items():
+        name = _attribute_names.get(key)
+        if name is None:
+            name = _attribute_names[key] = key[:-1] if key.endswith("_") else key
+        if value is True:
+            rendered.append(" " + name)
+        elif value is False or value is None:
+            continue
+        else:
+            if isinstance(value, list):
+                value = " ".join(value)
+            rendered.append(" " + name + '="' + str(value) + '"')
+    return "".join(rendered)
+
+
+# Closing tags by name, eg. "td" -> "</td>"
+_rendered_end_tags: Dict[str, str] = {}
+
+
+def _render_end_tag(name: str) -> str:
+    rendered = _rendered_end_tags.get(name)
+    if rendered is None:
+        rendered = _rendered_end_tags[name] = "</" + name + ">"
+    return rendered
+
+
 class Tag(AbstractTag):
+    __slots__ = ("name", "attributes", "_rendered_start")
+
     def __init__(self: "Tag", _name: str, **_kwargs: Any) -> None:
         self.name = _name
-        if _kwargs is not None:
+        self.attributes: Mapping[str, Any]
+        if _kwargs:
             self.attributes = {
                 k.replace("_", "-") if not k.endswith("_") else k: v
                 for k, v in _kwargs.items()
             }
         else:
-            self.attributes = {}
+            self.attributes = _NO_ATTRIBUTES
+        self._rendered_start: Optional[str] = None
+
+    def _render_start(self: "Tag") -> str:
+        # Tags are not changed after they are created (__call__ and the class
+        # shorthand return new Tags), so the rendered tag can be kept
+        if self._rendered_start is None:
+            self._rendered_start = (
+                "<" + self.name + _render_attributes(self.attributes) + ">"
+            )
+        return self._rendered_start
 
     def create_start_tag(self: "Tag") -> "StartTag":
-        return StartTag(self.name, **self.attributes)
+        start_tag = StartTag(self.name, **self.attributes)
+        start_tag._rendered_start = self._render_start()
+        return start_tag
 
     def __pos__(self: "Tag") -> "StartTag":
         return self.create_start_tag()
 
     def __neg__(self: "Tag") -> "EndTag":
-        return EndTag(self.name)
+        return _end_tag(self.name)
+
+    def _copy(self: "Tag", attributes: Dict[str, Any]) -> "Tag":
+        return type(self)(self.name, **attributes)
 
     def __call__(self: "Tag", shorthand: Optional[str] = None, **kwargs: Any) -> "Tag":
 
-        new_attributes = self.attributes.copy()
+        new_attributes = dict(self.attributes)
 
         # parse class/id shorthand
         if shorthand is not None:
@@ -94,13 +272,13 @@ class Tag(AbstractTag):
                 new_attributes["id_"] = classes[0][1:]
                 del classes[0]
             if classes:
-                new_attributes.setdefault("class_", [])
-                new_attributes["class_"].extend(classes)
+                new_attributes["class_"] = [*new_attributes.get("class_", ()), *classes]
 
         # walrus operator? :=
         class_item = kwargs.pop("class_", None)
         if class_item is not None:
-            new_attributes.setdefault("class_", [])
+            # copy the class list so the tag this was called on is unchanged
+            new_attributes["class_"] = list(new_attributes.get("class_", ()))
             if isinstance(class_item, str):
                 # convert "class1 class2" into ['class1', 'class2']
                 new_attributes["class_"].extend(class_item.split(" "))
@@ -114,11 +292,7 @@ class Tag(AbstractTag):
                 for k, v in kwargs.items()
             }
         )
-
-        #        if isinstance(self, ComponentTag):
-        #            return type(self)(self.name, self.render, **new_attributes)
-        #        else:
-        return type(self)(self.name, **new_attributes)
+        return self._copy(new_attributes)
 
     def __add__(self: "Tag", other: Any) -> "Fragment":
         raise BMXSyntaxError(
@@ -145,16 +319,38 @@ class Tag(AbstractTag):
         return Fragment(other) - self
 
     def __getattr__(self: "Tag", attr: str) -> "Tag":
+        if attr.startswith("__"):
+            # Not a class name: a special method looked up by eg. pickle or copy
+            raise AttributeError(attr)
         dashed_attr = attr.replace("_", "-")
-        new_attributes = self.attributes.copy()
-        if new_attributes.get("class_", None) is None:
-            new_attributes["class_"] = []
-        new_attributes["class_"].append(dashed_attr)
-
-        #        if isinstance(self, ComponentTag):
-        #            return type(self)(self.name, self.render, **new_attributes)
-        #        else:
-        return type(self)(self.name, **new_attributes)
+        new_attributes = dict(self.attributes)
+        new_attributes["class_"] = [*new_attributes.get("class_", ()), dashed_attr]
+        return self._copy(new_attributes)
+
+    def iter_chunks(self: "Tag", chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+        return iter_chunks(self, chunk_size)
+
+    def write_to(
+        self: "Tag",
+        fp: Any,
+        encoding: str = "utf-8",
+        buffer_size: int = DEFAULT_CHUNK_SIZE,
+        binary: Optional[bool] = None,
+    ) -> None:
+        write_to(self, fp, encoding, buffer_size, binary)
+
+    def __reduce__(self: "Tag") -> Tuple[Any, ...]:
+        # The shared empty attributes cannot be pickled, so all the slots that
+        # are set are pickled, with plain dict attributes
+        state = {}
+        for cls in type(self).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                try:
+                    state[name] = object.__getattribute__(self, name)
+                except AttributeError:
+                    pass
+        state["attributes"] = dict(self.attributes)
+        return copyreg.__newobj__, (type(self),), (None, state)  # type: ignore
 
     def __repr__(self: "Tag") -> str:
         attrs_repr = repr(self.attributes) if self.attributes else ""
@@ -177,16 +373,22 @@ class Tag(AbstractTag):
 
 
 class StartTag(Tag):
+    __slots__ = ()
+
     def __init__(
         self: "StartTag",
         _name: str,
         **_kwargs: Any,
     ) -> None:
         self.name = _name
-        self.attributes = _kwargs if _kwargs else {}
+        self.attributes = _kwargs if _kwargs else _NO_ATTRIBUTES
+        self._rendered_start: Optional[str] = None
 
     def render(self: "StartTag", *_contents: Any, **_attributes: Any) -> "Element":
-        return Element(self.name, *_contents, **_attributes)
+        element = Element(self.name, *_contents, **_attributes)
+        if _attributes == self.attributes:
+            element._rendered_start = self._render_start()
+        return element
 
     def __pos__(self: "StartTag") -> "StartTag":
         raise BMXSyntaxError(
@@ -237,32 +439,15 @@ class StartTag(Tag):
         )
 
     def __str__(self: "StartTag") -> str:
-        begin = "<"
-        end = ">"
-
-        if self.attributes:
-            attributes: List[str] = []
-            for key, value in self.attributes.items():
-                if str(key).endswith("_"):  # ie. for_, id_, class_
-                    key = key[:-1]
-                if value is True:
-                    attributes.extend(" " + key)
-                    continue
-                elif not value:
-                    continue
-                elif isinstance(value, list):
-                    value = " ".join(value)
-
-                attributes.extend(" " + str(key) + '="' + str(value) + '"')
-        else:
-            attributes = []
-
-        return "".join((begin, self.name, *attributes, end))
+        return self._render_start()
 
 
 class EndTag(Tag):
+    __slots__ = ()
+
     def __init__(self: "EndTag", _name: str) -> None:
         self.name = _name
+        self.attributes = _NO_ATTRIBUTES
 
     def __pos__(self: "EndTag") -> "StartTag":
         raise BMXSyntaxError(
@@ -310,13 +495,12 @@ class EndTag(Tag):
         )
 
     def __str__(self: "EndTag") -> str:
-        begin = "</"
-        end = ">"
-
-        return "".join((begin, self.name, end))
+        return _render_end_tag(self.name)
 
 
 class SelfClosingTag(Tag):
+    __slots__ = ("_self_closing_tag_style",)
+
     def __init__(
         self: "SelfClosingTag",
         _name: str,
@@ -324,8 +508,14 @@ class SelfClosingTag(Tag):
         **_kwargs: Any,
     ) -> None:
         self.name = _name
-        self.attributes = _kwargs if _kwargs else {}
+        self.attributes = _kwargs if _kwargs else _NO_ATTRIBUTES
         self._self_closing_tag_style = _self_closing_tag_style
+        self._rendered_start: Optional[str] = None
+
+    def _copy(self: "SelfClosingTag", attributes: Dict[str, Any]) -> "Tag":
+        if not attributes:
+            return _self_closing_tag(self.name, self._self_closing_tag_style)
+        return SelfClosingTag(self.name, self._self_closing_tag_style, **attributes)
 
     # TODO: is *_contents needed here?
     def render(
@@ -381,62 +571,182 @@ class SelfClosingTag(Tag):
             )
         )
 
+    def _render_start(self: "SelfClosingTag") -> str:
+        if self._rendered_start is None:
+            self._rendered_start = (
+                "<"
+                + self.name
+                + _render_attributes(self.attributes)
+                + self._self_closing_tag_style.value
+            )
+        return self._rendered_start
+
     def __str__(self: "SelfClosingTag") -> str:
-        begin = "<"
-        end = str(self._self_closing_tag_style)
+        return self._render_start()
 
-        if self.attributes:
-            attributes: List[str] = []
-            for key, value in self.attributes.items():
-                if str(key).endswith("_"):  # ie. for_, id_, class_
-                    key = key[:-1]
-                if value is True:
-                    attributes.extend(" " + key)
-                    continue
-                elif value is False:
-                    continue
-                elif isinstance(value, list):
-                    value = " ".join(value)
-
-                attributes.extend(" " + str(key) + '="' + str(value) + '"')
+
+# EndTags, and SelfClosingTags without attributes, hold nothing but their name
+# and style, so a single instance of each is shared
+_end_tags: Dict[str, EndTag] = {}
+_self_closing_tags: Dict[Tuple[str, SelfClosingTagStyle], SelfClosingTag] = {}
+
+
+def _end_tag(name: str) -> EndTag:
+    end_tag = _end_tags.get(name)
+    if end_tag is None:
+        end_tag = _end_tags[name] = EndTag(name)
+    return end_tag
+
+
+def _self_closing_tag(name: str, style: SelfClosingTagStyle) -> SelfClosingTag:
+    self_closing_tag = _self_closing_tags.get((name, style))
+    if self_closing_tag is None:
+        self_closing_tag = _self_closing_tags[(name, style)] = SelfClosingTag(
+            name, style
+        )
+    return self_closing_tag
+
+
+def _attribute_key(attributes: Mapping[str, Any]) -> Tuple[Any, ...]:
+    return tuple(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in sorted(attributes.items())
+    )
+
+
+def _contents_key(contents: Tuple[Any, ...]) -> Optional[str]:
+    """Return contents serialized, or None if serializing would consume them.
+
+    Lazy contents can only be produced once, and awaitables can only be
+    rendered asynchronously, so Components with them are not cached.
+    """
+    pieces: List[str] = []
+    stack: List[Iterator[Any]] = [iter(contents)]
+    while stack:
+        for item in stack[-1]:
+            if isinstance(item, str):
+                pieces.append(item)
+            elif isinstance(item, Element):
+                pieces.append(item._render_start())
+                stack.append(iter((item._render_end(),)))
+                stack.append(iter(item.contents))
+                break
+            elif isinstance(item, Fragment):
+                stack.append(iter(item._contents))
+                break
+            elif isinstance(item, (Lazy, Awaitable, AsyncIterable)):
+                return None
+            else:
+                pieces.append(str(item))
         else:
-            attributes = []
+            stack.pop()
+    return "".join(pieces)
+
+
+def _memoize_key(
+    func: Callable, contents: Tuple[Any, ...], attributes: Mapping[str, Any]
+) -> Optional[Tuple[Any, ...]]:
+    contents_key = _contents_key(contents)
+    if contents_key is None:
+        return None
+    key = (func, contents_key, _attribute_key(attributes))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _memoize(func: Callable, cache: LRU, ttl: Optional[float]) -> Callable:
+    # Cache the rendered output of func, keyed on func, its rendered contents
+    # and its attributes, so that Components can share a cache. Calls with
+    # unhashable attributes, or contents that cannot be rendered up front, are
+    # not cached.
+    def render(*contents: Any, **attributes: Any) -> Any:
+        key = _memoize_key(func, contents, attributes)
+        if key is None:
+            return func(*contents, **attributes)
+        result = cache.get(key)
+        if result is None:
+            result = Markup(str(func(*contents, **attributes)))
+            cache.set(key, result, ttl)
+        return result
+
+    async def render_async(*contents: Any, **attributes: Any) -> Any:
+        key = _memoize_key(func, contents, attributes)
+        if key is None:
+            return await func(*contents, **attributes)
+        result = cache.get(key)
+        if result is None:
+            result = Markup(str(await func(*contents, **attributes)))
+            cache.set(key, result, ttl)
+        return result
+
+    # Imported here, as inspect takes longer to import than the rest of bmx
+    from inspect import iscoroutinefunction
+
+    if iscoroutinefunction(func):
+        return update_wrapper(render_async, func)
+    return update_wrapper(render, func)
+
+
+def Component(
+    func: Optional[Callable] = None,
+    *,
+    cache: Optional[LRU] = None,
+    ttl: Optional[float] = None,
+) -> Any:
+    """Turn a function into a Tag which renders its contents with the function.
+
+    Components which only depend on their contents and attributes can cache
+    their rendered output with ``@Component(cache=LRU(maxsize=100), ttl=60)``.
+    Giving only a ttl uses a new ``LRU``.
+
+    The function can be ``async``, in which case the page must be rendered
+    with ``bmx.aio.render_async``.
+    """
+    if func is None:
+        return lambda func: Component(func, cache=cache, ttl=ttl)
+    if cache is None and ttl is not None:
+        cache = LRU()
+    render_func = func if cache is None else _memoize(func, cache, ttl)
+
+    return ComponentTag(func.__name__.replace("_", "-"), render_func)
+
+
+class StartComponentTag(StartTag):
+    __slots__ = ("func",)
+
+    def __init__(
+        self: "StartComponentTag", _name: str, _func: Callable, **_attributes: Any
+    ) -> None:
+        super().__init__(_name, **_attributes)
+        self.func = _func
+
+    def render(self: "StartComponentTag", *args: Any, **kwargs: Any) -> Any:
+        return self.func(*args, **kwargs)
 
-        return "".join((begin, self.name, *attributes, end))
 
+class ComponentTag(Tag):
+    """A Tag whose Elements are rendered by func, created by :func:`Component`.
 
-def Component(func: Callable) -> Tag:
-    class RenderMixin(ABC):
-        def render(self: "RenderMixin", *args: Any, **kwargs: Any) -> Any:
-            return func(*args, **kwargs)
+    Every component shares this class and holds its function as data, so
+    defining a component does not create any classes.
+    """
 
-    class StartComponentTag(RenderMixin, StartTag):
-        def __init__(
-            self: "StartComponentTag",
-            _name: str,
-            #            render: Callable,
-            **_attributes: Any,
-        ) -> None:
-            super().__init__(_name, **_attributes)
-            # setattr(self, "render", render)
-            # self.render = render
+    __slots__ = ("func",)
 
-    class ComponentTag(Tag):
-        def __init__(
-            self: "ComponentTag",
-            _name: str,
-            #            render: Callable,
-            **_attributes: Any,
-        ) -> None:
-            super().__init__(_name, **_attributes)
-            # setattr(self, "render", render)
-            # self.render = render
+    def __init__(
+        self: "ComponentTag", _name: str, _func: Callable, **_attributes: Any
+    ) -> None:
+        super().__init__(_name, **_attributes)
+        self.func = _func
 
-        def create_start_tag(self: "ComponentTag") -> StartComponentTag:
-            return StartComponentTag(self.name, **self.attributes)
+    def _copy(self: "ComponentTag", attributes: Dict[str, Any]) -> "Tag":
+        return ComponentTag(self.name, self.func, **attributes)
 
-    new_tag = ComponentTag(func.__name__.replace("_", "-"))
-    return new_tag
+    def create_start_tag(self: "ComponentTag") -> StartComponentTag:
+        return StartComponentTag(self.name, self.func, **self.attributes)
 
 
 class BMXSyntaxError(SyntaxError):
@@ -444,12 +754,17 @@ class BMXSyntaxError(SyntaxError):
 
 
 class Element:
+    __slots__ = ("name", "contents", "attributes", "_rendered_start")
+
     def __init__(
         self: "Element", _name: str, *_contents: Any, **_attributes: Any
     ) -> None:
         self.name = _name
-        self.contents = list(_contents)
-        self.attributes = _attributes
+        self.contents = _contents
+        self.attributes: Mapping[str, Any] = (
+            _attributes if _attributes else _NO_ATTRIBUTES
+        )
+        self._rendered_start: Optional[str] = None
 
     def __pos__(self: "Element") -> None:
         raise BMXSyntaxError(f"Cannot ' + ' an Element at {self!r}")
@@ -471,6 +786,12 @@ class Element:
             )
         return Fragment(self, -other)
 
+    def __reduce__(self: "Element") -> Tuple[Any, ...]:
+        if self.attributes:
+            state = {"attributes": dict(self.attributes)}
+            return Element, (self.name, *self.contents), (None, state)
+        return Element, (self.name, *self.contents)
+
     def __repr__(self: "Element") -> str:
         attrs_repr = repr(self.attributes) if self.attributes else ""
         contents_repr = repr(self.contents) if self.contents else ""
@@ -487,38 +808,224 @@ class Element:
             )
         )
 
+    def _render_start(self: "Element") -> str:
+        if self._rendered_start is None:
+            self._rendered_start = (
+                "<" + self.name + _render_attributes(self.attributes) + ">"
+            )
+        return self._rendered_start
+
+    def _render_end(self: "Element") -> str:
+        return _render_end_tag(self.name)
+
+    def iter_chunks(
+        self: "Element", chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[str]:
+        return iter_chunks(self, chunk_size)
+
+    def write_to(
+        self: "Element",
+        fp: Any,
+        encoding: str = "utf-8",
+        buffer_size: int = DEFAULT_CHUNK_SIZE,
+        binary: Optional[bool] = None,
+    ) -> None:
+        write_to(self, fp, encoding, buffer_size, binary)
+
     def __str__(self: "Element") -> str:
-        if self.attributes:
-            attributes: List[str] = []
-            for key, value in self.attributes.items():
-                if str(key).endswith("_"):  # ie. for_, id_, class_
-                    key = key[:-1]
-                if value is True:
-                    attributes.extend(" " + key)
-                    continue
-                elif value is False:
-                    continue
-                elif isinstance(value, list):
-                    value = " ".join(value)
-
-                attributes.extend(" " + str(key) + '="' + str(value) + '"')
-        else:
-            attributes = []
+        return "".join(_iter_markup(self))
+
+
+class Lazy:
+    """Contents which are only produced when the markup is serialized.
+
+    ``+table + Lazy(+tr +td +row.name -td -tr for row in cursor) -table``
+    keeps the generator in the Fragment instead of adding every row to it, so
+    streaming the table with iter_chunks or write_to holds one row at a time.
+    Each item is added to a new Fragment as it is produced. An iterator can
+    only be consumed once, so markup containing one can only be serialized
+    once.
+    """
+
+    __slots__ = ("_iterable",)
+
+    def __init__(self: "Lazy", iterable: Iterable) -> None:
+        self._iterable: Optional[Iterable] = iterable
+
+    def _consume(self: "Lazy") -> Iterator["Fragment"]:
+        iterable = self._iterable
+        if iterable is None:
+            raise BMXSyntaxError(f"{self!r} has already been serialized")
+        if iter(iterable) is iterable:
+            self._iterable = None
+        return (Fragment() + item for item in iterable)
+
+    def __repr__(self: "Lazy") -> str:
+        return "".join(("<Lazy|", hex(id(self)), " ", repr(self._iterable), ">"))
+
+
+class _AwaitableIterable(Awaitable, Iterable):
+    """Awaitables which are also iterable, eg. ``asyncio.Future``.
+
+    Registering this more specific ABC makes Fragments add such objects as
+    awaitables, where dispatch would otherwise be ambiguous.
+    """
+
+    @classmethod
+    def __subclasshook__(cls: Type["_AwaitableIterable"], other: type) -> Any:
+        # The methods are looked up directly, as Awaitable and Iterable check
+        # their subclasses, including this one
+        if cls is _AwaitableIterable:
+            return all(
+                any(vars(base).get(name) is not None for base in other.__mro__)
+                for name in ("__await__", "__iter__")
+            )
+        return NotImplemented
 
-        begin = ("<", self.name, *attributes, ">")
-        end = ("</", self.name, ">")
 
-        return "".join((*begin, *map(str, self.contents), *end))
+# The bmx.profiling.Profiler of the active profile() block, if any, which is
+# only seen by the thread or asyncio task that entered the block
+if sys.version_info < (3, 7):
+
+    class _ProfilerVar(threading.local):
+        # A thread's own value, as contextvars is new in Python 3.7
+        profiler: Any = None
+
+        def get(self: "_ProfilerVar") -> Any:
+            return self.profiler
+
+        def set(self: "_ProfilerVar", profiler: Any) -> Any:
+            token, self.profiler = self.profiler, profiler
+            return token
+
+        def reset(self: "_ProfilerVar", token: Any) -> None:
+            self.profiler = token
+
+    _profiler: Any = _ProfilerVar()
+else:
+    from contextvars import ContextVar
+
+    _profiler: "ContextVar[Any]" = ContextVar("bmx_profiler", default=None)
+
+
+# Linked stack of open StartTag positions: (position, parent) or None
+_OpenTags = Tuple[int, Any]
 
 
 class Fragment(Sequence):
+    """An ordered run of tags, strings and Elements produced by a BMX expression.
+
+    Fragments behave as immutable values but share their storage: every
+    Fragment is a view over the first ``_length`` entries of an append-only
+    buffer. The Fragment at the tip of a buffer (the one whose view covers all
+    of it) appends to it in place, so a chain like ``+ul +li +"x" -li -ul``
+    costs O(1) per operator instead of copying all contents each time. Any
+    other Fragment copies its view before appending, leaving the tip intact.
+
+    Closing a tag appends the new Element to the buffer rather than removing
+    its children. ``_starts[i]`` records where the top-level item ending at
+    position ``i`` begins, so walking back through ``_starts`` skips over the
+    entries that an Element has consumed.
+
+    ``_open`` is a linked stack of ``(position, parent)`` pairs for the
+    StartTags that are still waiting for their EndTag. Being immutable, it is
+    shared freely between Fragments, and the innermost StartTag is always
+    found in O(1).
+    """
+
     def __init__(self: "Fragment", *args: Any) -> None:
-        self._contents = args
-        # self.tagstack = [self]
+        self._items: List[Any] = list(args)
+        self._starts: List[int] = list(range(len(args)))
+        self._length = len(args)
+        self._cache: Optional[Tuple[Any, ...]] = args
+        self._open: Optional[_OpenTags] = None
+        for idx, item in enumerate(args):
+            if isinstance(item, StartTag):
+                self._open = (idx, self._open)
+
+    @classmethod
+    def _from_buffer(
+        cls: Type["Fragment"],
+        items: List[Any],
+        starts: List[int],
+        length: int,
+        open_tags: Optional[_OpenTags],
+    ) -> "Fragment":
+        fragment = cls.__new__(cls)
+        fragment._items = items
+        fragment._starts = starts
+        fragment._length = length
+        fragment._cache = None
+        fragment._open = open_tags
+        return fragment
+
+    @property
+    def _contents(self: "Fragment") -> Tuple[Any, ...]:
+        if self._cache is None:
+            items, starts = self._items, self._starts
+            contents = []
+            idx = self._length - 1
+            while idx >= 0:
+                contents.append(items[idx])
+                idx = starts[idx] - 1
+            contents.reverse()
+            self._cache = tuple(contents)
+        return self._cache
+
+    def _buffer(self: "Fragment") -> Tuple[List[Any], List[int]]:
+        # Only the tip of a buffer may extend it in place
+        if len(self._items) == self._length:
+            return self._items, self._starts
+        return self._items[: self._length], self._starts[: self._length]
+
+    def _append(self: "Fragment", item: Any) -> "Fragment":
+        items, starts = self._buffer()
+        items.append(item)
+        starts.append(self._length)
+        return Fragment._from_buffer(items, starts, self._length + 1, self._open)
+
+    def _extend(self: "Fragment", new_items: List[Any]) -> "Fragment":
+        if not new_items:
+            return self
+        items, starts = self._buffer()
+        items.extend(new_items)
+        starts.extend(range(self._length, self._length + len(new_items)))
+        return Fragment._from_buffer(
+            items, starts, self._length + len(new_items), self._open
+        )
 
-    # def __iter__(self):
-    # Not sure this is correct
-    #    return iter((i for c in self.tagstack for i in c.contents))
+    def _append_start_tag(self: "Fragment", item: StartTag) -> "Fragment":
+        items, starts = self._buffer()
+        items.append(item)
+        starts.append(self._length)
+        return Fragment._from_buffer(
+            items, starts, self._length + 1, (self._length, self._open)
+        )
+
+    def _close(self: "Fragment", open_tags: _OpenTags, other: Tag) -> "Fragment":
+        start, parent = open_tags
+        items, starts = self._items, self._starts
+        start_tag = items[start]
+        if start_tag.name != other.name:
+            raise BMXSyntaxError(
+                f"Tag mismatch. Appending {other!r} but found {start_tag!r}."
+            )
+        children = []
+        idx = self._length - 1
+        while idx > start:
+            children.append(items[idx])
+            idx = starts[idx] - 1
+        children.reverse()
+        profiler = _profiler.get()
+        if profiler is None:
+            new_element = start_tag.render(*children, **start_tag.attributes)
+        else:
+            new_element = profiler._render(start_tag, children)
+
+        items, starts = self._buffer()
+        items.append(new_element)
+        starts.append(start)
+        return Fragment._from_buffer(items, starts, self._length + 1, parent)
 
     def __len__(self: "Fragment") -> int:
         return len(self._contents)
@@ -533,58 +1040,94 @@ class Fragment(Sequence):
                 f"Cannot get item with index {index!r}. Index must be int or slice"
             )
 
-    @singledispatchmethod
+    @typedispatchmethod
     def __add__(self: "Fragment", other: Any) -> "Fragment":
-        return Fragment(*self._contents, str(other))
+        return self._append(str(other))
 
     @__add__.register(Tag)
     def _add_Tag(self: "Fragment", other: Tag) -> "Fragment":
         new_tag = other.create_start_tag()
-        return Fragment(*self._contents, new_tag)
+        return self._append_start_tag(new_tag)
 
     @__add__.register(StartTag)
     def _add_StartTag(self: "Fragment", other: StartTag) -> "Fragment":
-        return Fragment(*self._contents, other)
+        return self._append_start_tag(other)
 
     @__add__.register(EndTag)
     def _add_EndTag(self: "Fragment", other: EndTag) -> "Fragment":
-        # TODO: check for start tag in reversed(self._contents)
-        for idx, item in enumerate(reversed(self._contents)):
-            if isinstance(item, StartTag):
-                if item.name == other.name:
-                    new_element = item.render(
-                        *self._contents[len(self._contents) - idx :], **item.attributes
-                    )
-                    return Fragment(
-                        *self._contents[: len(self._contents) - idx - 1], new_element
-                    )
-                else:
-                    raise BMXSyntaxError(
-                        f"Tag mismatch. Appending {other!r} but found {item!r}."
-                    )
-        else:
-            return Fragment(*self._contents, other)
+        if self._open is None:
+            return self._append(other)
+        return self._close(self._open, other)
 
     @__add__.register(SelfClosingTag)
     def _add_SelfClosingTag(self: "Fragment", other: SelfClosingTag) -> "Fragment":
-        return Fragment(*self._contents, other)
+        return self._append(other)
 
     @__add__.register(str)
     def _add_str(self: "Fragment", other: str) -> "Fragment":
         # We use markupsafe to escape all strings to make them safe
-        return Fragment(*self._contents, escape(other))
+        return self._append(_escape(other))
 
     @__add__.register(Element)
     def _add_Element(self: "Fragment", other: Element) -> "Fragment":
-        return Fragment(*self._contents, other)
+        return self._append(other)
+
+    @__add__.register(Lazy)
+    def _add_Lazy(self: "Fragment", other: Lazy) -> "Fragment":
+        return self._append(other)
+
+    @__add__.register(Awaitable)
+    @__add__.register(_AwaitableIterable)
+    def _add_Awaitable(self: "Fragment", other: Awaitable) -> "Fragment":
+        # Awaited by bmx.aio.render_async
+        return self._append(other)
+
+    @__add__.register(AsyncIterable)
+    def _add_AsyncIterable(self: "Fragment", other: AsyncIterable) -> "Fragment":
+        # Iterated over by bmx.aio.render_async
+        return self._append(other)
 
     @__add__.register(Iterable)
     def _add_Iterable(self: "Fragment", other: Iterable) -> "Fragment":
-        for item in other:
-            self = self + item
-        return self
+        # Add all the items in a single pass, flattening nested Fragments and
+        # iterables as they come. Strings, Elements and SelfClosingTags are
+        # gathered and then added together; anything else goes through
+        # __add__ so that tags are matched and registered types are honoured.
+        # The buffer is only extended once the gathered items are complete, as
+        # iterating runs the caller's code, during which another thread can
+        # add to this Fragment.
+        if isinstance(other, (list, tuple)) and all(
+            type(item) is str for item in other
+        ):
+            # Only plain strings: escape them all at once
+            return self._extend(_escape_all(other))
+        dispatch = Fragment.__add__.dispatch  # type: ignore
+        fragment = self
+        gathered: List[Any] = []
+        iterators = [iter(other)]
+        while iterators:
+            for item in iterators[-1]:
+                impl = dispatch(type(item))
+                if impl is Fragment._add_str:
+                    gathered.append(_escape(item))
+                elif impl is Fragment._add_Iterable:
+                    if isinstance(item, Fragment):
+                        item = item._contents
+                    iterators.append(iter(item))
+                    break
+                elif (
+                    impl is Fragment._add_Element
+                    or impl is Fragment._add_SelfClosingTag
+                ):
+                    gathered.append(item)
+                else:
+                    fragment = impl(fragment._extend(gathered), item)
+                    gathered = []
+            else:
+                iterators.pop()
+        return fragment._extend(gathered)
 
-    @singledispatchmethod
+    @typedispatchmethod
     def __sub__(self: "Fragment", other: Any) -> "Fragment":
         raise BMXSyntaxError(
             f"Cannot 'subtract' {other!r} of type {type(other)!r}. Only Tags can be 'subtracted'"
@@ -592,22 +1135,12 @@ class Fragment(Sequence):
 
     @__sub__.register(Tag)
     def _sub_Tag(self: "Fragment", other: Tag) -> "Fragment":
-        # check for matching start tag in reversed(self._contents)
-        for idx, item in enumerate(reversed(self._contents)):
-            if isinstance(item, StartTag):
-                if item.name == other.name:
-                    new_element = item.render(
-                        *self._contents[len(self._contents) - idx :], **item.attributes
-                    )
-                    return Fragment(
-                        *self._contents[: len(self._contents) - idx - 1], new_element
-                    )
-                else:
-                    raise BMXSyntaxError(
-                        f"Tag mismatch. Appending {other!r} but found {item!r}."
-                    )
-        else:
-            return Fragment(*self._contents, -other)
+        if self._open is None:
+            return self._append(-other)
+        return self._close(self._open, other)
+
+    def __reduce__(self: "Fragment") -> Tuple[Any, ...]:
+        return Fragment, self._contents
 
     def __radd__(self: "Fragment", other: Any) -> "Fragment":
         return Fragment(other) + self._contents
@@ -620,19 +1153,198 @@ class Fragment(Sequence):
                 self_repr,
                 "contents=",
                 repr(self._contents),
-                # " ",
-                # "tagstack=",
-                # repr(self.tagstack),
                 ">",
             )
         )
 
+    def iter_chunks(
+        self: "Fragment", chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[str]:
+        return iter_chunks(self, chunk_size)
+
+    def write_to(
+        self: "Fragment",
+        fp: Any,
+        encoding: str = "utf-8",
+        buffer_size: int = DEFAULT_CHUNK_SIZE,
+        binary: Optional[bool] = None,
+    ) -> None:
+        write_to(self, fp, encoding, buffer_size, binary)
+
     def __str__(self: "Fragment") -> str:
-        result = []
-        for item in self._contents:
-            result.append(str(item))
-            # result.extend([str(i) for i in item.contents if hasattr(i, "contents")])
-        return "".join(result)
+        return "".join(_iter_markup(self))
+
+
+def _iter_markup(node: Any) -> Iterator[str]:
+    """Yield the serialized pieces of node in document order.
+
+    The tree is walked with an explicit stack of iterators rather than by
+    recursion, so arbitrarily deep markup cannot hit the recursion limit, and
+    no intermediate string is built for any subtree.
+    """
+    profiler = _profiler.get()
+    if profiler is not None:
+        yield from profiler._iter_markup(node)
+        return
+    stack: List[Iterator[Any]] = [iter((node,))]
+    while stack:
+        for item in stack[-1]:
+            if isinstance(item, str):
+                yield item
+            elif isinstance(item, Element):
+                yield item._render_start()
+                stack.append(iter((item._render_end(),)))
+                stack.append(iter(item.contents))
+                break
+            elif isinstance(item, Fragment):
+                stack.append(iter(item._contents))
+                break
+            elif isinstance(item, Lazy):
+                stack.append(item._consume())
+                break
+            elif isinstance(item, (Awaitable, AsyncIterable)):
+                raise BMXSyntaxError(
+                    f"Cannot render {item!r} synchronously, use bmx.aio.render_async"
+                )
+            else:
+                yield str(item)
+        else:
+            stack.pop()
+
+
+def iter_chunks(node: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Serialize node depth-first as a series of strings.
+
+    Pieces of markup are gathered until they reach chunk_size characters and
+    then yielded together, so no more than about one chunk is held in memory
+    beyond the tree itself. The result can be returned directly as a WSGI
+    response body, eg. ``Response(iter_chunks(page), mimetype="text/html")``
+    in Flask.
+    """
+    buffer: List[str] = []
+    size = 0
+    for piece in _iter_markup(node):
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def static(node: Any) -> Any:
+    """Render markup that never changes once, as a Markup string.
+
+    The result is added to Fragments as-is and serializes in O(1), so a large
+    navigation bar or an SVG icon costs nothing to build after the first time::
+
+        FOOTER = static(+footer +p +"Made with BMX" -p -footer)
+
+    Used as a decorator on a function without arguments, the function is
+    called once, on first use, and its rendered result is returned every time
+    after that.
+    """
+    if isinstance(node, str):
+        # Escaped like any string added to a Fragment, unless it is Markup
+        return escape(node)
+    if isinstance(node, (Element, Fragment, SelfClosingTag)):
+        if isinstance(node, Fragment) and node._open is not None:
+            raise BMXSyntaxError(f"Cannot make {node!r} static as it has unclosed tags")
+        return Markup(str(node))
+    if callable(node) and not isinstance(node, AbstractTag):
+        return _static_builder(node)
+    raise BMXSyntaxError(f"Cannot make {node!r} of type {type(node)!r} static")
+
+
+def _static_builder(func: Callable[[], Any]) -> Callable[[], Markup]:
+    rendered: List[Markup] = []
+
+    def builder() -> Markup:
+        if not rendered:
+            rendered.append(static(func()))
+        return rendered[0]
+
+    return update_wrapper(builder, func)
+
+
+def cached(
+    key: Hashable,
+    builder: Callable[[], Any],
+    ttl: Optional[float] = None,
+    tags: "Iterable[str]" = (),
+    cache: Optional[FragmentCache] = None,
+) -> Markup:
+    """Render a region of a page once and reuse it until it expires.
+
+    ``builder()`` is only called when key is not in the cache, and its markup
+    is stored rendered, for ttl seconds if given::
+
+        +aside + cached("sidebar", build_sidebar, ttl=60, tags=["nav"]) -aside
+
+    ``bmx.cache.fragment_cache.invalidate("nav")`` drops every region tagged
+    "nav". Regions are stored in ``bmx.cache.fragment_cache`` unless another
+    ``FragmentCache`` is given.
+    """
+    if cache is None:
+        cache = fragment_cache
+    tags = tuple(tags)
+    value = cache.get(key, tags)
+    if value is None:
+        fragment = Fragment() + builder()
+        if fragment._open is not None:
+            raise BMXSyntaxError(f"Cannot cache {fragment!r} as it has unclosed tags")
+        value = str(fragment)
+        cache.set(key, value, ttl, tags)
+    return Markup(value)
+
+
+def _is_text(fp: Any) -> bool:
+    # Text files have a mode without "b", and a StreamWriter encodes strings
+    if isinstance(fp, (io.TextIOBase, codecs.StreamWriter)):
+        return True
+    mode = getattr(fp, "mode", None)
+    return isinstance(mode, str) and "b" not in mode
+
+
+def _encoded(chunks: Iterator[str], encoding: str) -> Iterator[bytes]:
+    # An incremental encoder writes a byte order mark, if any, only once
+    encode = codecs.getincrementalencoder(encoding)().encode
+    for chunk in chunks:
+        yield encode(chunk)
+    end = encode("", final=True)
+    if end:
+        yield end
+
+
+def write_to(
+    node: Any,
+    fp: Any,
+    encoding: str = "utf-8",
+    buffer_size: int = DEFAULT_CHUNK_SIZE,
+    binary: Optional[bool] = None,
+) -> None:
+    """Serialize node into the file object fp.
+
+    The markup is written in chunks of about buffer_size characters, and fp
+    is flushed after each of them, so the memory used does not depend on the
+    size of the document. Text files, ie. ``io.TextIOBase``,
+    ``codecs.StreamWriter`` and file objects with a text ``mode``, are
+    written strings; any other object with a ``write`` method, eg. a binary
+    file or ``socket.makefile("wb")``, is written bytes in the given encoding.
+    Pass binary to choose for file objects which are neither.
+    """
+    if binary is None:
+        binary = not _is_text(fp)
+    chunks: Iterator[Any] = iter_chunks(node, buffer_size)
+    if binary:
+        chunks = _encoded(chunks, encoding)
+    flush = getattr(fp, "flush", None)
+    for chunk in chunks:
+        fp.write(chunk)
+        if flush is not None:
+            flush()
 
 
 class DOCTYPE(Enum):
@@ -666,19 +1378,32 @@ class DOCTYPE(Enum):
 class Namespace:
     """Create tags as object attributes.
 
-    Suitable for Web Components or ad-hoc XML markup"""
+    Suitable for Web Components or ad-hoc XML markup. Each tag is created
+    once per Namespace and then found as a plain attribute; tags listed in
+    vocabulary are created straight away, eg.
+    ``Namespace(vocabulary=("urlset", "url", "loc", "lastmod"))``."""
 
-    def __init__(self: "Namespace", prefix: str = None, translate: bool = True) -> None:
+    def __init__(
+        self: "Namespace",
+        prefix: str = None,
+        translate: bool = True,
+        vocabulary: "Iterable[str]" = (),
+    ) -> None:
         self.prefix = prefix
         self.translate = translate
+        for attr in vocabulary:
+            getattr(self, attr)
 
     def __getattr__(self: "Namespace", attr: str) -> Tag:
-        if attr.endswith("_"):
-            attr = attr[:-1]  # remove trailing '_' for python keyword clashes
+        # Special names are looked up by copy, pickle and the like
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        name = attr
+        if name.endswith("_"):
+            name = name[:-1]  # remove trailing '_' for python keyword clashes
         if self.translate:
-            attr = attr.replace("_", "-")
+            name = name.replace("_", "-")
         if self.prefix is not None:
-            name = self.prefix + attr
-        else:
-            name = attr
-        return Tag(name)
+            name = self.prefix + name
+        tag = self.__dict__[attr] = Tag(name)
+        return tag
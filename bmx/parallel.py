@@ -0,0 +1,134 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Serialize large markup with a pool of workers.
+
+``render_parallel`` splits a tree into parts of about ``min_size`` nodes or
+more, serializes the parts with a ``concurrent.futures`` executor and joins
+the results in document order.
+
+The executor is created by the caller, once, and can be shared by every
+call, eg. by every request of a web server. Elements, Fragments and Tags can
+be pickled, so a ``ProcessPoolExecutor`` can be used, but pickling a part
+costs more than serializing it, so it only pays off for parts that are slow
+to serialize. ``Lazy`` contents, whose generators cannot be pickled, can
+only be rendered with a thread pool, and awaitable contents can only be
+rendered by ``bmx.aio.render_async``.
+"""
+
+from concurrent.futures import Executor, Future
+import os
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .core import _iter_markup, Element, Fragment
+
+# Smallest number of nodes that is rendered in parallel
+DEFAULT_MIN_SIZE = 1000
+
+
+def _children(node: Any) -> Optional[Sequence[Any]]:
+    # Most nodes are strings, which are ruled out before the slower
+    # isinstance check against Fragment, an ABC
+    if isinstance(node, str):
+        return None
+    if isinstance(node, Element):
+        return node.contents
+    if isinstance(node, Fragment):
+        return node._contents
+    return None
+
+
+def _first_parent(nodes: Sequence[Any]) -> Any:
+    return next((node for node in nodes if _children(node)), None)
+
+
+def _estimate_size(node: Any, sizes: Dict[int, int]) -> int:
+    """Estimate the number of nodes in node.
+
+    Siblings are assumed to be the same size as the first of them that has
+    children, eg. the rows of a table, so only one path down the tree is
+    walked.
+    """
+    chain = []
+    item = node
+    while item is not None and id(item) not in sizes:
+        children = _children(item)
+        if not children:
+            sizes[id(item)] = 1
+            break
+        chain.append((item, children))
+        item = _first_parent(children)
+    for item, children in reversed(chain):
+        sizes[id(item)] = 1 + len(children) * sizes.get(id(_first_parent(children)), 1)
+    return sizes[id(node)]
+
+
+def _render_part(nodes: Sequence[Any]) -> str:
+    return "".join([piece for node in nodes for piece in _iter_markup(node)])
+
+
+class _Splitter:
+    def __init__(self: "_Splitter", executor: Executor, part_size: int) -> None:
+        self.executor = executor
+        self.part_size = part_size
+        self.sizes: Dict[int, int] = {}
+        self.pieces: List[Union[str, Future]] = []
+        self.batch: List[Any] = []
+        self.batch_size = 0
+
+    def flush(self: "_Splitter") -> None:
+        if self.batch:
+            self.pieces.append(self.executor.submit(_render_part, self.batch))
+            self.batch = []
+            self.batch_size = 0
+
+    def split(self: "_Splitter", root: Any) -> None:
+        # Subtrees larger than a part are opened up, and the rest are sent to
+        # the workers in runs of consecutive siblings of about part_size nodes
+        stack: List[Tuple[Iterator, str]] = [(iter(_children(root) or ()), "")]
+        while stack:
+            items = stack[-1][0]
+            for item in items:
+                size = _estimate_size(item, self.sizes)
+                if size <= self.part_size:
+                    self.batch.append(item)
+                    self.batch_size += size
+                    if self.batch_size >= self.part_size:
+                        self.flush()
+                    continue
+                self.flush()
+                end = ""
+                if isinstance(item, Element):
+                    self.pieces.append(item._render_start())
+                    end = item._render_end()
+                stack.append((iter(_children(item) or ()), end))
+                break
+            else:
+                self.flush()
+                end = stack.pop()[1]
+                if end:
+                    self.pieces.append(end)
+
+
+def _pieces(pieces: List[Union[str, Future]]) -> Iterator[str]:
+    for piece in pieces:
+        yield piece if isinstance(piece, str) else piece.result()
+
+
+def render_parallel(
+    node: Any, executor: Executor, min_size: int = DEFAULT_MIN_SIZE
+) -> str:
+    """Serialize node, sharing the work between the workers of an executor.
+
+    Markup of fewer than about ``min_size`` nodes is serialized directly.
+    """
+    root = Fragment(node)
+    total = _estimate_size(root, {})
+    if total < min_size:
+        return "".join(_iter_markup(root))
+    # Aim for a few parts per core so that uneven parts even out
+    part_size = max(min_size, total // (4 * (os.cpu_count() or 1)))
+    splitter = _Splitter(executor, part_size)
+    splitter.split(root)
+    return "".join(_pieces(splitter.pieces))
@@ -0,0 +1,184 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Find out which components and tags make a page slow to render.
+
+Inside ``with profile() as profiler:``, closing a tag and serializing markup
+are timed per component and per tag name::
+
+    with profile() as profiler:
+        str(page())
+    print(profiler.report())
+
+Times are inclusive: a component's build time includes the tags and
+components it builds, and an Element's serialize time includes its children,
+as well as any time spent between chunks by whatever consumes them. A profile
+covers the thread or asyncio task that enters it, and the tasks it starts, so
+each request of a web server can be profiled on its own. While no profile is
+active, rendering only checks whether one is.
+"""
+
+from collections.abc import AsyncIterable, Awaitable
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from . import core
+from .core import BMXSyntaxError, Element, Fragment, Lazy, StartComponentTag, StartTag
+
+_Frame = Tuple[str, str, float, int, Any]
+
+
+class Stats:
+    """What was recorded for one component or tag name."""
+
+    __slots__ = ("calls", "build_time", "serialize_time", "nodes", "bytes")
+
+    def __init__(self: "Stats") -> None:
+        self.calls = 0
+        self.build_time = 0.0
+        self.serialize_time = 0.0
+        self.nodes = 0
+        self.bytes = 0
+
+    def __repr__(self: "Stats") -> str:
+        return (
+            f"<Stats calls={self.calls} build_time={self.build_time:.6f}"
+            f" serialize_time={self.serialize_time:.6f} nodes={self.nodes}"
+            f" bytes={self.bytes}>"
+        )
+
+
+class Profiler:
+    """Collect Stats keyed on ("component" or "tag", name).
+
+    Subclasses can override record_build and record_serialize to send each
+    measurement somewhere else as it is made.
+    """
+
+    def __init__(self: "Profiler") -> None:
+        self.stats: Dict[Tuple[str, str], Stats] = {}
+        self._nodes = 0
+        # Markup returned by components, by id, to attribute its serialization
+        self._origins: Dict[int, Tuple[str, Any]] = {}
+
+    def _stats(self: "Profiler", kind: str, name: str) -> Stats:
+        stats = self.stats.get((kind, name))
+        if stats is None:
+            stats = self.stats[(kind, name)] = Stats()
+        return stats
+
+    def record_build(
+        self: "Profiler", kind: str, name: str, seconds: float, nodes: int
+    ) -> None:
+        stats = self._stats(kind, name)
+        stats.calls += 1
+        stats.build_time += seconds
+        stats.nodes += nodes
+
+    def record_serialize(
+        self: "Profiler", kind: str, name: str, seconds: float, size: int
+    ) -> None:
+        stats = self._stats(kind, name)
+        stats.serialize_time += seconds
+        stats.bytes += size
+
+    def _render(self: "Profiler", start_tag: StartTag, children: List[Any]) -> Any:
+        nodes = self._nodes
+        started = perf_counter()
+        result = start_tag.render(*children, **start_tag.attributes)
+        seconds = perf_counter() - started
+        self._nodes += 1
+        if isinstance(start_tag, StartComponentTag):
+            self._origins[id(result)] = (start_tag.name, result)
+            kind = "component"
+        else:
+            kind = "tag"
+        self.record_build(kind, start_tag.name, seconds, self._nodes - nodes)
+        return result
+
+    def _iter_markup(self: "Profiler", node: Any) -> Iterator[str]:
+        # The same walk as core._iter_markup, where each iterator on the stack
+        # can have a frame which is recorded once the iterator is exhausted
+        origins = self._origins
+        size = 0
+        stack: List[Tuple[Iterator[Any], Optional[_Frame]]] = [(iter((node,)), None)]
+        while stack:
+            items, frame = stack[-1]
+            for item in items:
+                origin = origins.get(id(item))
+                if origin is not None and (frame is None or frame[4] is not item):
+                    frame = ("component", origin[0], perf_counter(), size, item)
+                    stack.append((iter((item,)), frame))
+                    break
+                if isinstance(item, str):
+                    size += len(item.encode("utf-8"))
+                    yield item
+                elif isinstance(item, Element):
+                    frame = ("tag", item.name, perf_counter(), size, item)
+                    start = item._render_start()
+                    size += len(start.encode("utf-8"))
+                    yield start
+                    stack.append((iter((item._render_end(),)), frame))
+                    stack.append((iter(item.contents), None))
+                    break
+                elif isinstance(item, Fragment):
+                    stack.append((iter(item._contents), None))
+                    break
+                elif isinstance(item, Lazy):
+                    stack.append((item._consume(), None))
+                    break
+                elif isinstance(item, (Awaitable, AsyncIterable)):
+                    raise BMXSyntaxError(
+                        f"Cannot render {item!r} synchronously, use bmx.aio.render_async"
+                    )
+                else:
+                    piece = str(item)
+                    size += len(piece.encode("utf-8"))
+                    yield piece
+            else:
+                stack.pop()
+                if frame is not None:
+                    kind, name, started, start_size, _ = frame
+                    seconds = perf_counter() - started
+                    self.record_serialize(kind, name, seconds, size - start_size)
+
+    def report(self: "Profiler", sort: str = "serialize_time", limit: int = 20) -> str:
+        """Return a table of the limit names with the highest sort Stats."""
+        rows = sorted(
+            self.stats.items(), key=lambda row: getattr(row[1], sort), reverse=True
+        )
+        lines = [
+            f"{'kind':<10} {'name':<20} {'calls':>8} {'build ms':>10}"
+            f" {'serialize ms':>12} {'nodes':>8} {'bytes':>10}"
+        ]
+        for (kind, name), stats in rows[:limit]:
+            lines.append(
+                f"{kind:<10} {name:<20} {stats.calls:>8}"
+                f" {stats.build_time * 1e3:>10.3f} {stats.serialize_time * 1e3:>12.3f}"
+                f" {stats.nodes:>8} {stats.bytes:>10}"
+            )
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile(
+    profiler: Optional[Profiler] = None,
+    callback: Optional[Callable[[Profiler], Any]] = None,
+) -> Iterator[Profiler]:
+    """Profile the markup built and serialized in this block, in this context.
+
+    Yields the Profiler, a new one unless one is given, and passes it to
+    callback at the end of the block if given.
+    """
+    if profiler is None:
+        profiler = Profiler()
+    token = core._profiler.set(profiler)
+    try:
+        yield profiler
+    finally:
+        core._profiler.reset(token)
+        profiler._origins.clear()
+    if callback is not None:
+        callback(profiler)
@@ -30,7 +30,7 @@ def tests(session):
     session.run("pytest", *args)
 
 
-locations = "bmx", "tests", "noxfile.py"
+locations = "bmx", "benchmarks", "tests", "noxfile.py"
 
 
 @nox.session(python=["3.6", "3.7", "3.8", "3.9"])
@@ -60,3 +60,14 @@ def mypy(session):
     args = session.posargs or locations
     install_with_constraints(session, "mypy")
     session.run("mypy", *args)
+
+
+# The Python which recorded benchmarks/baseline.json, as times differ between versions
+@nox.session(python="3.11")
+def benchmarks(session):
+    args = session.posargs or [
+        "--baseline=benchmarks/baseline.json",
+        "--output=benchmark-results.json",
+    ]
+    session.run("poetry", "install", "--no-dev", external=True)
+    session.run("python", "-m", "benchmarks.suite", *args)
@@ -1,9 +1,14 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import asyncio
+import time
+
 import pytest
 
-from bmx.core import Component
+from bmx import LRU
+from bmx.aio import render_async
+from bmx.core import Component, Lazy
 from bmx.htmltags import a, body, div, h1, html, li, ul
 
 
@@ -53,3 +58,112 @@ def test_fragment_add_component(my_component):
         str(f + my_component + h1 + "hello" - h1 - my_component)
         == "<html><body><div><h1>hello</h1></div>"
     )
+
+
+def test_cached_component():
+    calls = []
+    cache = LRU(maxsize=2)
+
+    @Component(cache=cache)
+    def card(*contents, **attributes):
+        calls.append(contents)
+        return +div(class_="card", **attributes) + contents - div
+
+    for _ in range(3):
+        assert str(+card(id_="a") + "x" - card) == '<div class="card" id="a">x</div>'
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    assert str(+card(id_="a") + "y" - card) == '<div class="card" id="a">y</div>'
+    assert str(+card(id_="b") + "x" - card) == '<div class="card" id="b">x</div>'
+    assert len(calls) == 3
+    assert cache.evictions == 1
+
+
+def test_cached_component_ttl(monkeypatch):
+    calls = []
+
+    @Component(ttl=10)
+    def clock(*contents, **attributes):
+        calls.append(contents)
+        return +div + contents - div
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    str(+clock - clock)
+    str(+clock - clock)
+    assert len(calls) == 1
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    str(+clock - clock)
+    assert len(calls) == 2
+
+
+def test_cached_component_with_unhashable_attributes():
+    @Component(cache=LRU())
+    def box(*contents, **attributes):
+        return +div(**attributes) + contents - div
+
+    assert str(+box(data={"a": 1}) - box) == "<div data=\"{'a': 1}\"></div>"
+
+
+def test_components_share_classes(my_component):
+    @Component
+    def other(*contents, **attributes):
+        return +div + contents - div
+
+    assert type(my_component) is type(other)
+    assert type(+my_component) is type(+other)
+
+
+def test_component_attributes_keep_function(my_component):
+    tag = my_component(id_="x")(title="y")
+    assert tag.func is my_component.func
+    assert str(+tag + "z" - tag) == '<div id="x" title="y">z</div>'
+
+
+def test_components_sharing_a_cache():
+    shared = LRU()
+
+    @Component(cache=shared)
+    def navbar(*contents, **attributes):
+        return +div + "NAV" - div
+
+    @Component(cache=shared)
+    def foot(*contents, **attributes):
+        return +div + "FOOT" - div
+
+    assert str(+navbar - navbar) == "<div>NAV</div>"
+    assert str(+foot - foot) == "<div>FOOT</div>"
+
+
+def test_cached_component_with_lazy_contents():
+    calls = []
+
+    @Component(cache=LRU())
+    def card(*contents, **attributes):
+        calls.append(1)
+        return +div + contents - div
+
+    rows = Lazy(+li + str(idx) - li for idx in range(2))
+    page = +card + ul + rows - ul - card
+    assert str(page) == "<div><ul><li>0</li><li>1</li></ul></div>"
+    str(+card + ul + Lazy(["x"]) - ul - card)
+    assert len(calls) == 2
+
+
+def test_cached_async_component_with_awaitable_contents():
+    @Component(cache=LRU())
+    async def card(*contents, **attributes):
+        return +div + contents - div
+
+    async def fetch():
+        return "<x>"
+
+    async def render():
+        return "".join([chunk async for chunk in render_async(+card + fetch() - card)])
+
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(render()) == "<div>&lt;x&gt;</div>"
+    finally:
+        loop.close()
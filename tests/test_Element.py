@@ -1,11 +1,13 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import pickle
+
 from markupsafe import Markup
 import pytest
 
 from bmx.core import BMXSyntaxError, Element, Fragment, Tag
-from bmx.htmltags import span
+from bmx.htmltags import br, div, span
 
 
 @pytest.fixture
@@ -83,3 +85,35 @@ def test_markup_objects_are_not_escaped():
         str(+span + Markup(f"Content is: {content}") - span)
         == "<span>Content is: <script>callSomeJavascript();</script></span>"
     )
+
+
+def test_iter_chunks_element(my_element):
+    assert "".join(my_element.iter_chunks()) == str(my_element)
+
+
+def test_iter_chunks_are_bounded():
+    f = +span + [Element("b", "x" * 10) for _ in range(100)] - span
+    chunks = list(f[0].iter_chunks(chunk_size=64))
+    assert "".join(chunks) == str(f)
+    assert len(chunks) > 1
+    assert all(len(chunk) < 64 + 20 for chunk in chunks)
+
+
+def test_str_deeply_nested_element():
+    node = Element("span", "leaf")
+    for _ in range(5000):
+        node = Element("div", node)
+    assert str(node) == "<div>" * 5000 + "<span>leaf</span>" + "</div>" * 5000
+
+
+def test_elements_without_attributes_share_empty_attributes():
+    first = Element("td", "a")
+    second = Element("td", "b")
+    assert first.attributes is second.attributes
+    assert not first.attributes
+    assert first.contents == ("a",)
+
+
+def test_pickle_element():
+    element = (+div(id_="a") + span + "<x>" - span + br - div)[0]
+    assert str(pickle.loads(pickle.dumps(element))) == str(element)
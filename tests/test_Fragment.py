@@ -1,11 +1,19 @@
 #!/usr/bin/env python
 
+import codecs
+import io
+import tempfile
+import threading
+
+from markupsafe import escape, Markup
 import pytest
 
 from bmx.core import (
     BMXSyntaxError,
+    Element,
     EndTag,
     Fragment,
+    Lazy,
     SelfClosingTag,
     SelfClosingTagStyle,
     StartTag,
@@ -92,3 +100,218 @@ def test_fragment_minus_tag():
     f = Fragment()
     html = Tag("html")
     assert str(f - html) == "</html>"
+
+
+def test_reused_fragment_keeps_its_value():
+    html = Tag("html")
+    body = Tag("body")
+    p = Tag("p")
+    f = +html + body
+    first = f + p + "first" - p - body
+    second = f + "second" - body
+    assert str(f) == "<html><body>"
+    assert str(first) == "<html><body><p>first</p></body>"
+    assert str(second) == "<html><body>second</body>"
+    assert str(first - html) == "<html><body><p>first</p></body></html>"
+
+
+def test_fragment_closes_tags_after_sibling_elements():
+    ul = Tag("ul")
+    li = Tag("li")
+    f = +ul
+    for i in range(3):
+        f = f + li + str(i) - li
+    f = f - ul
+    assert len(f) == 1
+    assert str(f) == "<ul><li>0</li><li>1</li><li>2</li></ul>"
+
+
+def test_fragment_closes_nested_tags_innermost_first():
+    div = Tag("div")
+    span = Tag("span")
+    f = Fragment()
+    for _ in range(50):
+        f = f + div + span + "x" - span
+    for _ in range(50):
+        f = f - div
+    assert len(f) == 1
+    assert str(f) == "<div><span>x</span>" * 50 + "</div>" * 50
+
+
+def test_unbalanced_tags_fail_after_closed_siblings(start_html):
+    li = Tag("li")
+    f = Fragment() + start_html + li + "x" - li
+    with pytest.raises(BMXSyntaxError):
+        f - li
+
+
+def test_register_new_content_type():
+    class Money(float):
+        pass
+
+    f = Fragment() + Money(1.5)
+    assert str(f) == "1.5"
+
+    @Fragment.__add__.register(Money)
+    def _add_Money(self, other):
+        return self + f"${other:.2f}"
+
+    assert str(Fragment() + Money(1.5)) == "$1.50"
+
+
+def test_fragment_iter_chunks(start_html, end_html):
+    f = Fragment() + start_html + "<content>" + end_html
+    assert list(f.iter_chunks()) == ["<html>&lt;content&gt;</html>"]
+
+
+def test_fragment_plus_nested_iterables():
+    ul = Tag("ul")
+    li = Tag("li")
+    items = ("<one>", [+li + "two" - li, ("three", (+li, "four", -li))])
+    f = +ul + items - ul
+    assert len(f) == 1
+    assert str(f) == "<ul>&lt;one&gt;<li>two</li>three<li>four</li></ul>"
+
+
+def test_fragment_plus_generator_of_open_fragments():
+    ul = Tag("ul")
+    li = Tag("li")
+    f = +ul + (+li + str(i) for i in range(3))
+    f = f - li - li - li - ul
+    assert str(f) == "<ul><li>0<li>1<li>2</li></li></li></ul>"
+
+
+def test_write_to_text_and_binary_files():
+    html = Tag("html")
+    p = Tag("p")
+    f = +html + [+p + f"<{idx}> é" - p for idx in range(100)] - html
+    text = io.StringIO()
+    f.write_to(text, buffer_size=64)
+    assert text.getvalue() == str(f)
+    binary = io.BytesIO()
+    f.write_to(binary, buffer_size=64)
+    assert binary.getvalue() == str(f).encode("utf-8")
+    binary = io.BytesIO()
+    f.write_to(binary, encoding="utf-16", buffer_size=64)
+    assert binary.getvalue() == str(f).encode("utf-16")
+
+
+def test_write_to_writes_in_chunks():
+    class Recorder:
+        def __init__(self):
+            self.writes = []
+
+        def write(self, data):
+            self.writes.append(data)
+
+    html = Tag("html")
+    p = Tag("p")
+    f = +html + [+p + "x" * 10 - p for _ in range(100)] - html
+    recorder = Recorder()
+    f.write_to(recorder, buffer_size=100)
+    assert all(len(data) < 200 for data in recorder.writes)
+    assert b"".join(recorder.writes) == str(f).encode()
+
+
+def test_write_to_other_text_streams():
+    html = Tag("html")
+    f = +html + "é" * 100 - html
+    binary = io.BytesIO()
+    f.write_to(codecs.getwriter("utf-8")(binary), buffer_size=10)
+    assert binary.getvalue() == str(f).encode("utf-8")
+    with tempfile.SpooledTemporaryFile(mode="w") as fp:
+        f.write_to(fp, buffer_size=10)
+        fp.seek(0)
+        assert fp.read() == str(f)
+
+
+def test_write_to_flushes_each_chunk():
+    class Recorder:
+        def __init__(self):
+            self.events = []
+
+        def write(self, data):
+            self.events.append(data)
+
+        def flush(self):
+            self.events.append("flush")
+
+    html = Tag("html")
+    p = Tag("p")
+    f = +html + [+p + "x" * 10 - p for _ in range(20)] - html
+    recorder = Recorder()
+    f.write_to(recorder, buffer_size=100, binary=False)
+    assert len(recorder.events) > 2
+    assert recorder.events[1::2] == ["flush"] * (len(recorder.events) // 2)
+    assert "".join(recorder.events[::2]) == str(f)
+
+
+def test_lazy_contents_are_produced_when_serialized():
+    ul = Tag("ul")
+    li = Tag("li")
+    produced = []
+
+    def rows():
+        for idx in range(3):
+            produced.append(idx)
+            yield +li + f"<{idx}>" - li
+
+    f = +ul + Lazy(rows()) - ul
+    assert produced == []
+    chunks = f.iter_chunks(chunk_size=1)
+    assert next(chunks) == "<ul>"
+    assert produced == []
+    assert (
+        "".join(chunks) == "<li>&lt;0&gt;</li><li>&lt;1&gt;</li><li>&lt;2&gt;</li></ul>"
+    )
+    assert produced == [0, 1, 2]
+    with pytest.raises(BMXSyntaxError):
+        str(f)
+
+
+def test_lazy_iterable_can_be_serialized_again():
+    ul = Tag("ul")
+    f = +ul + Lazy(["a", "b"]) - ul
+    assert str(f) == str(f) == "<ul>ab</ul>"
+
+
+STRINGS = ["plain", "<b>", "a & b", "'quoted'", '"double"', "", "nul\0<x>", "42"]
+
+
+def test_strings_are_escaped_like_markupsafe():
+    for value in STRINGS * 2:
+        assert str(Fragment() + value) == escape(value)
+    assert str(Fragment() + STRINGS) == "".join(escape(value) for value in STRINGS)
+    assert str(Fragment() + tuple(STRINGS[:-2])) == "".join(
+        escape(value) for value in STRINGS[:-2]
+    )
+
+
+def test_markup_is_not_escaped_again():
+    f = Fragment() + [Markup("<b>"), "<b>"]
+    assert str(f) == "<b>&lt;b&gt;"
+    assert str(Fragment() + f) == str(f)
+    assert all(isinstance(item, Markup) for item in Fragment() + STRINGS)
+
+
+def test_add_iterable_while_another_thread_adds_to_the_fragment():
+    prefix = Fragment(StartTag("html"), StartTag("body"))
+    started, added = threading.Event(), threading.Event()
+    other = []
+
+    def rows():
+        started.set()
+        added.wait(timeout=5)
+        yield Element("p", "A")
+
+    def add():
+        started.wait(timeout=5)
+        other.append(str(prefix + Element("p", "B") + EndTag("body") + EndTag("html")))
+        added.set()
+
+    thread = threading.Thread(target=add)
+    thread.start()
+    page = str(prefix + rows() + EndTag("body") + EndTag("html"))
+    thread.join()
+    assert page == "<html><body><p>A</p></body></html>"
+    assert other == ["<html><body><p>B</p></body></html>"]
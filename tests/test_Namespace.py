@@ -37,3 +37,16 @@ def test_namespace_with_prefix_and_translation():
         str(+shoelace.icon_button(name="gear", disabled=True))
         == '<sl-icon-button name="gear" disabled>'
     )
+
+
+def test_namespace_caches_tags():
+    sitemap = Namespace(vocabulary=("urlset", "url", "loc"))
+    assert {"urlset", "url", "loc"} <= set(vars(sitemap))
+    assert sitemap.url is sitemap.url
+    assert sitemap.lastmod is sitemap.lastmod
+    entry = +sitemap.url + sitemap.loc + "/" - sitemap.loc - sitemap.url
+    assert str(entry) == "<url><loc>/</loc></url>"
+    assert str(+sitemap.url(priority="1") + "x" - sitemap.url) == (
+        '<url priority="1">x</url>'
+    )
+    assert str(+sitemap.url) == "<url>"
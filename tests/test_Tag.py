@@ -1,5 +1,7 @@
 #!/usr/bin/env python
 
+import pickle
+
 import pytest
 
 from bmx.core import (
@@ -69,6 +71,20 @@ def test_neg_tag(my_tag):
     assert type(closing) == EndTag
 
 
+def test_end_tags_are_shared(my_tag):
+    assert -my_tag is -Tag("my-tag")
+
+
+def test_self_closing_tags_without_attributes_are_shared(my_self_closing_tag):
+    assert my_self_closing_tag() is my_self_closing_tag()
+    assert my_self_closing_tag(checked=True) is not my_self_closing_tag(checked=True)
+
+
+def test_self_closing_tag_keeps_style_when_called():
+    assert str(meta(charset="utf-8")) == '<meta charset="utf-8">'
+    assert str(meta()) == "<meta>"
+
+
 def test_keyword_args_as_attributes(my_tag):
     keyword_args_tag = my_tag(attr1="val1", attr2="val2")
     assert keyword_args_tag.attributes == {"attr1": "val1", "attr2": "val2"}
@@ -139,6 +155,11 @@ def test_str_tag(my_tag):
     assert str(-my_tag) == "</my-tag>"
 
 
+def test_iter_chunks_tag(my_tag):
+    assert list((+my_tag).iter_chunks()) == ["<my-tag>"]
+    assert list((-my_tag).iter_chunks()) == ["</my-tag>"]
+
+
 def test_str_tag_with_attributes(my_tag_with_attributes):
     assert str(+my_tag_with_attributes) == '<my-tag attr1="val1" attr2="val2">'
 
@@ -150,12 +171,47 @@ def test_str_tag_with_id_and_classes(my_tag_with_id_and_classes):
     )
 
 
+def test_rendered_start_tag_follows_attributes(my_tag_with_attributes):
+    assert str(+my_tag_with_attributes) == '<my-tag attr1="val1" attr2="val2">'
+    changed = my_tag_with_attributes(attr2="changed")
+    assert str(+changed) == '<my-tag attr1="val1" attr2="changed">'
+    assert str(+my_tag_with_attributes) == '<my-tag attr1="val1" attr2="val2">'
+    assert (
+        str((+changed - changed)[0]) == '<my-tag attr1="val1" attr2="changed"></my-tag>'
+    )
+
+
 def test_setting_class_twice(my_tag):
     tag_with_1_class = my_tag(class_="class1")
     tag_with_2_classes = tag_with_1_class(class_="class2")
     assert tag_with_2_classes.attributes["class_"] == ["class1", "class2"]
 
 
+def test_setting_class_leaves_original_tag_unchanged(my_tag):
+    tag_with_1_class = my_tag.class1
+    tag_with_2_classes = tag_with_1_class.class2
+    tag_with_3_classes = tag_with_2_classes(class_="class3")
+    assert tag_with_1_class.attributes["class_"] == ["class1"]
+    assert tag_with_2_classes.attributes["class_"] == ["class1", "class2"]
+    assert tag_with_3_classes.attributes["class_"] == ["class1", "class2", "class3"]
+
+
+def test_none_and_false_attributes_are_omitted(my_tag):
+    tag = my_tag(title=None, hidden=False, value=0, data_empty="")
+    assert str(+tag) == '<my-tag value="0" data-empty="">'
+
+
 def test_keywords_arg_with_underscores_replaced_with_dashes(my_tag):
     tag_with_data_attribute = my_tag(data_bmx="some data")
     assert tag_with_data_attribute.attributes["data-bmx"] == "some data"
+
+
+def test_pickle_tags(my_tag_with_id_and_classes):
+    for tag in (my_tag_with_id_and_classes, +h1, -h1, meta(charset="utf-8")):
+        copy = pickle.loads(pickle.dumps(tag))
+        assert type(copy) is type(tag)
+        assert dict(copy.attributes) == dict(tag.attributes)
+    assert (
+        str(pickle.loads(pickle.dumps(meta(charset="utf-8"))))
+        == '<meta charset="utf-8">'
+    )
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+
+import asyncio
+
+import pytest
+
+from bmx import LRU
+from bmx.aio import render_async
+from bmx.core import BMXSyntaxError, Component, Lazy
+from bmx.htmltags import div, li, p, ul
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def render(node, chunk_size=8192):
+    return [chunk async for chunk in render_async(node, chunk_size)]
+
+
+async def fetch(value):
+    await asyncio.sleep(0)
+    return value
+
+
+@Component
+async def user(*contents, **attributes):
+    name = await fetch(attributes["name"])
+    return +p + name - p
+
+
+def test_async_component():
+    page = +div + user(name="<Ann>") - user - div
+    assert run(render(page)) == ["<div><p>&lt;Ann&gt;</p></div>"]
+
+
+def test_awaitables_and_async_generators_as_content():
+    async def rows():
+        for idx in range(3):
+            yield +li + await fetch(f"Row {idx}") - li
+
+    page = +div + fetch("<b>") + ul + rows() - ul - div
+    assert "".join(run(render(page))) == (
+        "<div>&lt;b&gt;<ul><li>Row 0</li><li>Row 1</li><li>Row 2</li></ul></div>"
+    )
+
+
+def test_awaitables_run_concurrently_in_document_order():
+    async def scenario():
+        ready = asyncio.Event()
+
+        async def waits():
+            await ready.wait()
+            return "first"
+
+        async def sets():
+            ready.set()
+            return "second"
+
+        page = +div + waits() + sets() - div
+        return await asyncio.wait_for(render(page), timeout=1)
+
+    assert run(scenario()) == ["<div>firstsecond</div>"]
+
+
+def test_awaitables_in_awaited_results():
+    @Component
+    async def outer(*contents, **attributes):
+        return +div + contents - div
+
+    page = +outer + user(name="Ann") - user - outer
+    assert run(render(page)) == ["<div><p>Ann</p></div>"]
+
+
+def test_render_async_chunks():
+    page = +ul + [+li + fetch("x" * 10) - li for _ in range(10)] - ul
+    chunks = run(render(page, chunk_size=50))
+    assert len(chunks) > 1
+    assert "".join(chunks) == str(+ul + [+li + "x" * 10 - li for _ in range(10)] - ul)
+
+
+def test_cached_async_component():
+    calls = []
+
+    @Component(cache=LRU())
+    async def card(*contents, **attributes):
+        calls.append(contents)
+        return +div + contents - div
+
+    for _ in range(2):
+        assert run(render(+card + "x" - card)) == ["<div>x</div>"]
+    assert len(calls) == 1
+
+
+def test_str_with_awaitable_fails():
+    coroutine = fetch("x")
+    with pytest.raises(BMXSyntaxError):
+        str(+div + coroutine - div)
+    run(coroutine)
+
+
+def test_lazy_rows_with_awaitables():
+    page = +ul + Lazy(+li + fetch(f"<{idx}>") - li for idx in range(2)) - ul
+    assert run(render(page)) == ["<ul><li>&lt;0&gt;</li><li>&lt;1&gt;</li></ul>"]
+
+
+def test_future_contents():
+    async def page():
+        future = asyncio.get_event_loop().create_future()
+        asyncio.get_event_loop().call_soon(future.set_result, "<done>")
+        return await render(+p + future - p)
+
+    assert run(page()) == ["<p>&lt;done&gt;</p>"]
+
+
+def test_same_awaitable_added_twice():
+    value = fetch("x")
+    assert run(render(+ul + li + value - li + li + value - li - ul)) == [
+        "<ul><li>x</li><li>x</li></ul>"
+    ]
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+from markupsafe import Markup
+
+from bmx import compile
+from bmx.batch import render_many, write_many
+from bmx.htmltags import body, h1, html, li, p, ul
+
+RECORDS = [
+    {"id": idx, "name": f"<User {idx}>", "items": [f"Item {n}" for n in range(idx % 3)]}
+    for idx in range(25)
+]
+
+
+def page(record):
+    items = (+li + item - li for item in record["items"])
+    return +html + body + h1 + record["name"] - h1 + ul + items - ul - body - html
+
+
+@compile
+def email(record):
+    return +p + f"Dear {record['name']}" - p
+
+
+def numbered(record):
+    items = (+li + f"{idx}. {item}" - li for idx, item in enumerate(record["items"]))
+    return +ul + items - ul
+
+
+def comment(record):
+    name = record["name"] if record["name"] is not None else "anonymous"
+    return +p + name - p + Markup(record["body"])
+
+
+def path(tmp_path):
+    return lambda record: tmp_path / f"{record['id']}.html"
+
+
+def page_path(record):
+    return f"{record['directory']}/{record['id']}.html"
+
+
+def test_render_many():
+    expected = [str(page(record)) for record in RECORDS]
+    assert list(render_many(page, RECORDS)) == expected
+    assert list(render_many(email, iter(RECORDS))) == [
+        email.interpret(record) for record in RECORDS
+    ]
+
+
+def test_render_many_loop_index():
+    expected = [str(numbered(record)) for record in RECORDS]
+    assert list(render_many(numbered, RECORDS)) == expected
+    assert list(render_many(numbered, RECORDS, processes=2, batch_size=4)) == expected
+
+
+def test_render_many_plain_template_is_not_compiled():
+    records = [{"name": None, "body": "<b>hi</b>"}, {"name": "Ann", "body": "<i>"}]
+    expected = ["<p>anonymous</p><b>hi</b>", "<p>Ann</p><i>"]
+    assert list(render_many(comment, records)) == expected
+    assert list(render_many(comment, records, processes=2, batch_size=1)) == expected
+
+
+def test_render_many_processes():
+    expected = [str(page(record)) for record in RECORDS]
+    assert list(render_many(page, RECORDS, processes=2, batch_size=4)) == expected
+    assert list(render_many(email, RECORDS, processes=2, batch_size=4)) == [
+        email(record) for record in RECORDS
+    ]
+
+
+def test_write_many(tmp_path):
+    assert write_many(page, RECORDS, path(tmp_path)) == len(RECORDS)
+    assert (tmp_path / "3.html").read_text() == str(page(RECORDS[3]))
+
+
+def test_write_many_processes(tmp_path):
+    records = [dict(record, directory=str(tmp_path)) for record in RECORDS]
+    assert write_many(page, records, page_path, processes=2, batch_size=4) == 25
+    assert (tmp_path / "24.html").read_text() == str(page(RECORDS[24]))
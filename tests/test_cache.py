@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+
+import pickle
+
+from markupsafe import Markup
+import pytest
+
+from bmx import cached, FragmentCache
+from bmx.cache import CacheBackend, LRU
+from bmx.core import BMXSyntaxError, Tag
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRU(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert (cache.hits, cache.misses, cache.evictions) == (3, 1, 1)
+    assert len(cache) == 2
+
+
+def test_lru_ttl(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("time.monotonic", lambda: now)
+    cache = LRU()
+    cache.set("a", 1, ttl=5)
+    assert cache.get("a") == 1
+    now += 5
+    assert cache.get("a", "missing") == "missing"
+    assert len(cache) == 0
+
+
+def test_lru_hit_ratio():
+    cache = LRU()
+    assert cache.hit_ratio == 0.0
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+    assert cache.hit_ratio == 0.5
+
+
+class PickledDict(CacheBackend):
+    """Stands in for a store shared between processes."""
+
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, key, default=None):
+        value = self.entries.get(pickle.dumps(key))
+        return default if value is None else pickle.loads(value)
+
+    def set(self, key, value, ttl=None):
+        self.entries[pickle.dumps(key)] = pickle.dumps(value)
+
+
+def sidebar(calls):
+    nav = Tag("nav")
+    calls.append(1)
+    return +nav + f"<{len(calls)}>" - nav
+
+
+def test_cached_builds_region_once():
+    cache = FragmentCache()
+    calls = []
+    for _ in range(3):
+        value = cached("sidebar", lambda: sidebar(calls), cache=cache)
+        assert value == Markup("<nav>&lt;1&gt;</nav>")
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (2, 1)
+    aside = Tag("aside")
+    page = +aside + cached("sidebar", lambda: sidebar(calls), cache=cache) - aside
+    assert str(page) == "<aside><nav>&lt;1&gt;</nav></aside>"
+
+
+def test_cached_invalidate_by_tag():
+    cache = FragmentCache(PickledDict())
+    calls = []
+    cached("a", lambda: sidebar(calls), tags=["nav", "user:1"], cache=cache)
+    cached("b", lambda: sidebar(calls), tags=["user:2"], cache=cache)
+    cache.invalidate("user:1")
+    assert cached("a", lambda: sidebar(calls), tags=["nav", "user:1"], cache=cache)
+    assert cached("b", lambda: sidebar(calls), tags=["user:2"], cache=cache)
+    assert len(calls) == 3
+    assert cache.hit_ratio == 0.25
+
+
+def test_cached_ttl(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("time.monotonic", lambda: now)
+    cache = FragmentCache()
+    calls = []
+    cached("sidebar", lambda: sidebar(calls), ttl=5, cache=cache)
+    now += 5
+    assert cached("sidebar", lambda: sidebar(calls), ttl=5, cache=cache) == Markup(
+        "<nav>&lt;2&gt;</nav>"
+    )
+
+
+def test_cached_rejects_unclosed_tags():
+    nav = Tag("nav")
+    with pytest.raises(BMXSyntaxError):
+        cached("nav", lambda: +nav, cache=FragmentCache())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+
+import pytest
+from markupsafe import escape, Markup
+
+from bmx import compile
+from bmx.core import DOCTYPE
+from bmx.htmltags import a, body, h1, head, html, input_, li, p, title, ul
+
+
+class NavigationItem:
+    def __init__(self, href, caption):
+        self.href = href
+        self.caption = caption
+
+
+@compile
+def greeter(name):
+    page = DOCTYPE.html + html + head + title + "Greeter" - title - head
+    return page + body + p + f"Hello {name}" - p - body - html
+
+
+@compile
+def navigation(items, heading, checked=False):
+    links = (+li + a(href=item.href) + item.caption - a - li for item in items)
+    page = +h1 + heading - h1 + ul("#navigation") + links - ul
+    return page + input_(type_="checkbox", checked=checked)
+
+
+ITEMS = [NavigationItem("/a", "A"), NavigationItem("/b", "<B>")]
+
+
+def test_compile_greeter():
+    assert greeter.traced
+    assert greeter("<Stuart>") == greeter.interpret("<Stuart>")
+    assert "<p>Hello &lt;Stuart&gt;</p>" in greeter("<Stuart>")
+
+
+def test_compile_loop_and_attributes():
+    assert navigation.traced
+    for items in (ITEMS, [], ITEMS[:1]):
+        for checked in (True, False):
+            expected = navigation.interpret(items, "Title", checked=checked)
+            assert navigation(items, "Title", checked=checked) == expected
+
+
+def test_compile_untraceable_function_is_interpreted():
+    @compile
+    def optional_heading(heading):
+        if heading:
+            return +h1 + heading - h1
+        return +p + "No heading" - p
+
+    assert not optional_heading.traced
+    assert optional_heading("Title") == "<h1>Title</h1>"
+    assert optional_heading("") == "<p>No heading</p>"
+
+
+def test_compile_falls_back_when_arguments_do_not_fit():
+    @compile
+    def names(people):
+        return +ul + (+li + person["name"] - li for person in people) - ul
+
+    assert names.traced
+    assert names([{"name": "Ann"}]) == "<ul><li>Ann</li></ul>"
+    # The original function is called, and raises its own error
+    with pytest.raises(KeyError):
+        names([{"first": "Ann"}])
+
+
+@compile
+def numbered(items):
+    return +ul + (+li + f"{idx}: {item}" - li for idx, item in enumerate(items)) - ul
+
+
+@compile
+def shouted(name):
+    return +p + str(name).upper() - p
+
+
+@compile
+def initials(name):
+    return +p + str(name)[:3] - p
+
+
+@compile
+def shouted_greeting(name):
+    return +p + f"Hello {name}".upper() - p
+
+
+def test_compile_loop_counter_is_not_a_constant():
+    assert not numbered.traced
+    assert (
+        numbered(["x", "y", "z"]) == "<ul><li>0: x</li><li>1: y</li><li>2: z</li></ul>"
+    )
+
+
+def test_compile_string_methods_are_not_traced():
+    for template, expected in (
+        (shouted, "<p>BOB</p>"),
+        (initials, "<p>bob</p>"),
+        (shouted_greeting, "<p>HELLO BOB</p>"),
+    ):
+        assert not template.traced
+        assert template("bobby" if template is initials else "bob") == expected
+
+
+def test_compile_attribute_values_render_like_bmx():
+    @compile
+    def link(query, caption):
+        return +a(href=f"/search?{query}", title=caption) + caption - a
+
+    assert link.traced
+    for query, caption in (('b=1&c="2"', "<t>"), ("q=x", "plain")):
+        assert link(query, caption) == link.interpret(query, caption)
+
+
+def test_compile_markup_of_an_argument_is_not_traced():
+    @compile
+    def markup(body):
+        return +p + Markup(body) - p
+
+    @compile
+    def escaped(body):
+        return +p + escape(body) - p
+
+    for template in (markup, escaped):
+        assert not template.traced
+    assert markup("<b>hi</b>") == "<p><b>hi</b></p>"
+    assert escaped("<b>hi</b>") == "<p>&lt;b&gt;hi&lt;/b&gt;</p>"
+
+
+def test_compile_identity_and_type_checks_are_not_traced():
+    @compile
+    def named(name):
+        return +p + (name if name is not None else "anonymous") - p
+
+    @compile
+    def described(value):
+        return +p + ("text" if isinstance(value, str) else "other") - p
+
+    @compile
+    def type_name(value):
+        return +p + type(value).__name__ - p
+
+    for template in (named, described, type_name):
+        assert not template.traced
+    assert named(None) == "<p>anonymous</p>"
+    assert described(1) == "<p>other</p>"
+    assert type_name(1) == "<p>int</p>"
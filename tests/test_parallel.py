@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from bmx.core import Element, Lazy
+from bmx.htmltags import body, br, div, html, table, td, tr
+from bmx.parallel import render_parallel
+
+
+@pytest.fixture
+def dashboard():
+    def widget(idx):
+        rows = (
+            +tr + [+td + f"<{row},{col}>" - td for col in range(5)] - tr
+            for row in range(50)
+        )
+        return +div(class_="widget", id_=f"w{idx}") + table + rows - table + br - div
+
+    return +html + body + [widget(idx) for idx in range(6)] - body - html
+
+
+def test_render_parallel_threads(dashboard):
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert render_parallel(dashboard, executor, min_size=20) == str(dashboard)
+
+
+def test_render_parallel_processes(dashboard):
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        assert render_parallel(dashboard, executor, min_size=100) == str(dashboard)
+
+
+def test_render_parallel_small_markup_is_rendered_directly(dashboard):
+    class NoExecutor:
+        def submit(self, *args, **kwargs):
+            raise AssertionError("Nothing should be submitted")
+
+    assert render_parallel(dashboard, NoExecutor(), min_size=10_000) == str(dashboard)
+
+
+def test_render_parallel_deep_markup():
+    node = Element("span", "leaf")
+    for _ in range(5000):
+        node = Element("div", node)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert render_parallel(node, executor, min_size=10) == str(node)
+
+
+def test_render_parallel_shared_pool_in_threads(dashboard):
+    pages = [+div + f"page {idx}" + dashboard - div for idx in range(4)]
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        with ThreadPoolExecutor(max_workers=4) as threads:
+            rendered = threads.map(
+                lambda page: render_parallel(page, pool, min_size=100), pages
+            )
+            assert list(rendered) == [str(page) for page in pages]
+
+
+def test_render_parallel_lazy_contents_with_threads():
+    rows = [+tr + td + str(idx) - td - tr for idx in range(100)]
+    node = +table + [Lazy(iter(rows[idx : idx + 10])) for idx in range(0, 100, 10)]
+    node = node - table
+    expected = "<table>" + "".join(str(row) for row in rows) + "</table>"
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert render_parallel(node, executor, min_size=5) == expected
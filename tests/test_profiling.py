@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+
+import threading
+
+from bmx import core, profile
+from bmx.core import Component, Lazy, Tag
+from bmx.profiling import Profiler
+
+div = Tag("div")
+li = Tag("li")
+ul = Tag("ul")
+
+
+@Component
+def card(*contents, **attributes):
+    return +div + contents - div
+
+
+def page():
+    return +ul + (+li + card + "é" - card - li for _ in range(3)) - ul
+
+
+def test_profile_records_components_and_tags():
+    with profile() as profiler:
+        html = str(page())
+    assert core._profiler.get() is None
+    stats = profiler.stats
+    assert set(stats) == {
+        ("component", "card"),
+        ("tag", "div"),
+        ("tag", "li"),
+        ("tag", "ul"),
+    }
+    assert [stats[("tag", name)].calls for name in ("div", "li", "ul")] == [3, 3, 1]
+    assert stats[("component", "card")].nodes == 6
+    assert stats[("tag", "ul")].bytes == len(html.encode("utf-8"))
+    assert stats[("component", "card")].bytes == 3 * len("<div>é</div>".encode())
+    assert stats[("component", "card")].build_time > 0
+    assert stats[("tag", "li")].serialize_time > 0
+    report = profiler.report(sort="nodes", limit=2).splitlines()
+    assert len(report) == 3
+    assert report[1].split()[:3] == ["component", "card", "3"]
+
+
+def test_profile_output_is_unchanged():
+    expected = str(page())
+    with profile():
+        assert str(page()) == expected
+        assert str(+ul + Lazy([+li + "x" - li]) - ul) == "<ul><li>x</li></ul>"
+
+
+def test_profile_hooks_and_callback():
+    events = []
+    reports = []
+
+    class Recorder(Profiler):
+        def record_build(self, kind, name, seconds, nodes):
+            events.append(("build", kind, name, nodes))
+
+        def record_serialize(self, kind, name, seconds, size):
+            events.append(("serialize", kind, name, size))
+
+    with profile(Recorder(), callback=reports.append) as profiler:
+        str(+ul + "x" - ul)
+    assert events == [("build", "tag", "ul", 1), ("serialize", "tag", "ul", 10)]
+    assert reports == [profiler]
+
+
+def test_profile_blocks_overlapping_in_threads():
+    a_entered, b_entered, a_exited = (threading.Event() for _ in range(3))
+    profilers = {}
+
+    def profile_a():
+        with profile() as profiler:
+            a_entered.set()
+            b_entered.wait(timeout=5)
+            str(+ul + "a" - ul)
+        profilers["a"] = profiler
+        a_exited.set()
+
+    def profile_b():
+        a_entered.wait(timeout=5)
+        with profile() as profiler:
+            b_entered.set()
+            a_exited.wait(timeout=5)
+            str(+div + "b" - div)
+        profilers["b"] = profiler
+        profilers["after b"] = core._profiler.get()
+
+    threads = [threading.Thread(target=profile_a), threading.Thread(target=profile_b)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert set(profilers["a"].stats) == {("tag", "ul")}
+    assert set(profilers["b"].stats) == {("tag", "div")}
+    assert profilers["after b"] is None
+    assert core._profiler.get() is None
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+
+import pytest
+from markupsafe import Markup
+
+from bmx import static
+from bmx.core import BMXSyntaxError, Fragment
+from bmx.htmltags import a, br, li, nav, ul
+
+
+def navigation():
+    links = (+li + a(href=f"/{idx}") + f"<{idx}>" - a - li for idx in range(3))
+    return +nav + ul + links - ul - nav
+
+
+def test_static_renders_markup():
+    frozen = static(navigation())
+    assert isinstance(frozen, Markup)
+    assert frozen == str(navigation())
+
+
+def test_static_is_added_as_is():
+    frozen = static(navigation())
+    assert str(+ul + li + frozen - li - ul) == f"<ul><li>{navigation()}</li></ul>"
+
+
+def test_static_self_closing_tag():
+    assert static(br) == "<br>"
+
+
+def test_static_unclosed_fragment_fails():
+    with pytest.raises(BMXSyntaxError):
+        static(+ul + li)
+
+
+def test_static_tag_fails():
+    with pytest.raises(BMXSyntaxError):
+        static(ul)
+
+
+def test_static_decorator_builds_once():
+    calls = []
+
+    @static
+    def footer():
+        calls.append(True)
+        return navigation()
+
+    assert footer() == str(navigation())
+    assert footer() is footer()
+    assert len(calls) == 1
+    assert footer.__name__ == "footer"
+    assert isinstance(Fragment() + footer(), Fragment)
+
+
+def test_static_escapes_strings():
+    assert static("<script>x</script>") == "&lt;script&gt;x&lt;/script&gt;"
+    assert static(Markup("<b>")) == "<b>"
+
+    @static
+    def label():
+        return "<b>"
+
+    assert label() == "&lt;b&gt;"